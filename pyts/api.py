@@ -28,6 +28,10 @@ define the TurbSim grid.
 4) The :mod:`io` module, which supports reading and writing of TurbSim
 input (.inp) and output files (e.g. .bl, .wnd, etc.)
 
+5) The :class:`phaseStore <pyts.store.phaseStore>` class, which stores
+the correlated phases of a run so that runs that change only the
+spectral model can reuse them.
+
 Example usage of this API can be found in the <pyts_root>/Examples/api.py file.
 
 .. literalinclude:: ../../../examples/api.py
@@ -36,6 +40,7 @@ Example usage of this API can be found in the <pyts_root>/Examples/api.py file.
 """
 from main import tsrun
 from base import tsGrid
+from store import phaseStore
 import profModels.api as profModels
 import specModels.api as specModels
 import cohereModels.api as cohereModels
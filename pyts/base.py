@@ -292,6 +292,80 @@ class gridObj(tsBaseObj):
     clockwise = True
     n_tower = 0  # This is a placeholder.
 
+    @property
+    def y(self,):
+        """
+        The lateral position of the grid points.
+        """
+        return self._y
+
+    @y.setter
+    def y(self, val):
+        self._y = val
+        self._geom = {}
+
+    @property
+    def z(self,):
+        """
+        The vertical position of the grid points.
+        """
+        return self._z
+
+    @z.setter
+    def z(self, val):
+        self._z = val
+        self._geom = {}
+
+    @property
+    def sub_inds(self,):
+        """
+        The subscripts (iz, iy) of all of the grid points (i.e.
+        :meth:`ind2sub` for all 'flattened' indices).
+        """
+        if 'sub_inds' not in self._geom:
+            ind = np.arange(self.n_p)
+            self._geom['sub_inds'] = (ind // self.n_y, np.mod(ind, self.n_y))
+        return self._geom['sub_inds']
+
+    @property
+    def pair_inds(self,):
+        """
+        The indices (ii, jj) of the grid-point pairs in the packed
+        lower-triangular (LAPACK 'L', column-major) storage that is
+        used for the coherence matrix (ii >= jj).
+        """
+        if 'pair_inds' not in self._geom:
+            jj, ii = np.triu_indices(self.n_p)
+            self._geom['pair_inds'] = (ii, jj)
+        return self._geom['pair_inds']
+
+    @property
+    def pair_dist(self,):
+        """
+        The distance between each pair of grid points (packed, see
+        :attr:`pair_inds`).
+        """
+        if 'pair_dist' not in self._geom:
+            iz, iy = self.sub_inds
+            ii, jj = self.pair_inds
+            self._geom['pair_dist'] = np.sqrt(
+                (self.y[iy[ii]] - self.y[iy[jj]]) ** ts_float(2) +
+                (self.z[iz[ii]] - self.z[iz[jj]]) ** ts_float(2))
+        return self._geom['pair_dist']
+
+    @property
+    def pair_zmean(self,):
+        """
+        The mean height of each pair of grid points (packed, see
+        :attr:`pair_inds`).
+        """
+        if 'pair_zmean' not in self._geom:
+            iz = self.sub_inds[0]
+            ii, jj = self.pair_inds
+            self._geom['pair_zmean'] = ((self.z[iz[ii]] + self.z[iz[jj]]) /
+                                        ts_float(2))
+        return self._geom['pair_zmean']
+
     def __getitem__(self, ind):
         if hasattr(ind, '__len__'):
             if len(ind) == 1:
@@ -38,16 +38,61 @@ Available coherence models
   subclass this class or subclass and modify an existing coherence
   model.
 
+:class:`~.cache.factorCache`
+  An on-disk cache of coherence factors. Set a coherence model's
+  `cache` attribute to an instance of this class to reuse factors
+  between runs.
+
 :class:`~.base.cohereObj`
   This is the 'coherence object' class.  All coherence model `__call__`
   methods must take a :class:`tsrun <pyts.main.tsrun>` as input and
   return this class.
 
+:class:`~.sparse.sparseBackend`
+  A sparse (distance-truncated, banded) coherence backend for large
+  grids. Set a coherence model's `backend` attribute to an instance of
+  this class to use it.
+
+:class:`~.circulant.circulantBackend`
+  A circulant-embedding (FFT) coherence backend for coherence models
+  that depend only on the separation of the points (e.g. iec).
+
+:class:`~.toeplitz.toeplitzBackend`
+  A block-Toeplitz (block Levinson) coherence backend for coherence
+  that is homogeneous in y (e.g. nwtc with the built-in profiles).
+
+:class:`~.fsubset.freqSubsetBackend`
+  A coherence backend that factors the coherence on an adaptive
+  subset of the frequencies (within a coherence-error tolerance).
+
+:class:`~.bank.factorBank`
+  An in-memory bank of coherence factors keyed by the scaled
+  frequency (f/U), that reuses factors between runs at different mean
+  wind speeds (a coherence backend).
+
+:class:`~.lowrank.lowRankBackend`
+  A low-rank (truncated eigen-decomposition) coherence backend that
+  synthesizes the phases from the dominant modes of the coherence.
+
+:mod:`~.backends`
+  The registry of coherence backends (by name, e.g. 'tslib', 'numpy',
+  'sparse', 'cache'), and the automatic selection of a backend for a
+  run (see also the `cohere_backend` of :class:`tsrun
+  <pyts.main.tsrun>`).
+
 Further details on creating your own coherence model, can be found in
 :mod:`pyts.cohereModels.base` documentation.
 
 """
 from .base import cohereObj, cohereModelBase
+from .cache import factorCache
+from .sparse import sparseBackend
+from .circulant import circulantBackend
+from .toeplitz import toeplitzBackend
+from .fsubset import freqSubsetBackend
+from .bank import factorBank
+from .lowrank import lowRankBackend
+from . import backends
 import main
 
 iec = main.iec
@@ -0,0 +1,314 @@
+"""
+This module defines the registry of coherence (correlation)
+'backends', and the automatic selection of a backend for a coherence
+object.
+
+A backend is a callable, `backend(cohi, tmp, comp, f)`, that
+correlates the (stacked) phases `tmp` (np x n_rhs x nf, in place)
+according to the coherence of component `comp` of the coherence object
+`cohi` at the frequencies `f`. Backends may instead define a
+`calc_phases(cohi, phases, fslice)` method that replaces the
+coherence object's :meth:`calc_phases
+<pyts.cohereModels.base.cohereObj.calc_phases>` (e.g. the factor
+cache).
+
+Each coherence object lists the names of the backends that it
+supports in its `backends` attribute. When no backend is set
+explicitly (with a coherence model's `backend` attribute or the
+`cohere_backend` of a :class:`tsrun <pyts.main.tsrun>`), one of the
+Cholesky backends (which produce the same time-series for the same
+random seed) is selected by :func:`select` from the size of the grid,
+the available memory, and a (one-time) micro-benchmark. The other
+backends (e.g. 'toeplitz' or 'circulant') produce different
+time-series for the same random seed, so they are only used when they
+are set explicitly.
+
+The micro-benchmark timings are stored in `bench_file` (by default
+~/.pyts/backend_bench.json, or the file set by the PYTS_BENCH_FILE
+environment variable). If it is None (or PYTS_BENCH_FILE is set to an
+empty string), the timings are not stored.
+
+Example usage
+-------------
+
+>>> import pyts.api as pyts
+>>> tsr = pyts.tsrun(cohere_backend='numpy')
+
+"""
+from ..base import np, ts_complex, userroot
+from numpy import random
+from .sparse import sparseBackend
+from .circulant import circulantBackend
+from .toeplitz import toeplitzBackend
+from .fsubset import freqSubsetBackend
+from .bank import factorBank
+from .lowrank import lowRankBackend
+from .cache import factorCache
+from collections import OrderedDict
+from os import path
+import json
+import time
+import os
+
+# The file in which the micro-benchmark timings are stored (None: the
+# timings are not stored).
+bench_file = os.environ.get(
+    'PYTS_BENCH_FILE',
+    path.join(userroot, '.pyts', 'backend_bench.json')) or None
+# Grids with fewer points than this use the first (exact) backend
+# that is supported, without a benchmark.
+bench_min_np = 64
+# The number of frequencies that each backend is timed on.
+bench_n_f = 2
+
+# The registered backends (name -> class).
+registry = OrderedDict()
+
+
+def register(cls):
+    """
+    Add the backend class `cls` to the registry (under `cls.name`).
+
+    The class may define `available(cohi)` (a staticmethod that
+    returns False if the backend can not be used by the coherence
+    object `cohi`), `auto` (True if the backend may be selected
+    automatically; this should only be set for backends that produce
+    the Cholesky realization, i.e. the same time-series as the other
+    automatic backends for the same random seed) and `dense` (True if
+    the backend holds the full coherence matrix of a frequency in
+    memory).
+    """
+    registry[cls.name] = cls
+    return cls
+
+
+class tslibBackend(object):
+
+    """
+    The tslib (Fortran, OpenMP) Cholesky-factorization backend.
+
+    This uses `ncore` threads itself, so it is not used with the
+    process-pool coherence calculations.
+    """
+    name = 'tslib'
+    parallel = False
+    auto = True
+    dense = True
+
+    @staticmethod
+    def available(cohi):
+        return cohi.uses_tslib
+
+    def __repr__(self,):
+        return '<PyTurbSim tslib coherence backend>'
+
+    def __call__(self, cohi, tmp, comp, f):
+        cohi._correlate_group(tmp, comp, f)
+        cohi._add_info(backend=self.name)
+
+
+class numpyBackend(object):
+
+    """
+    The batched NumPy Cholesky-factorization backend (see
+    :meth:`cohereObj._correlate_numpy
+    <pyts.cohereModels.base.cohereObj._correlate_numpy>`).
+    """
+    name = 'numpy'
+    auto = True
+    dense = True
+
+    def __repr__(self,):
+        return '<PyTurbSim NumPy coherence backend>'
+
+    def __call__(self, cohi, tmp, comp, f):
+        cohi._correlate_numpy(tmp, comp, f)
+        cohi._add_info(backend=self.name)
+
+
+class cacheBackend(object):
+
+    """
+    The on-disk coherence-factor cache backend (see
+    :class:`factorCache <pyts.cohereModels.cache.factorCache>`).
+
+    Parameters
+    ----------
+    cache : :class:`factorCache <pyts.cohereModels.cache.factorCache>`, optional
+            The cache (default: the coherence object's `cache`, or a
+            cache in the default directory).
+    """
+    name = 'cache'
+    parallel = False
+
+    def __init__(self, cache=None):
+        self.cache = cache
+
+    def __repr__(self,):
+        return '<PyTurbSim cache coherence backend: %r>' % (self.cache, )
+
+    @staticmethod
+    def available(cohi):
+        return cohi._cache_inputs(cohi._coh_comps[0]) is not None
+
+    def calc_phases(self, cohi, phases, fslice=slice(None)):
+        cache = self.cache
+        if cache is None:
+            cache = cohi.cache
+        if cache is None:
+            cache = self.cache = factorCache()
+        out = cohi._calc_phases_cached(phases, fslice, cache)
+        cohi._add_info(backend=self.name)
+        return out
+
+
+register(tslibBackend)
+register(numpyBackend)
+register(toeplitzBackend)
+register(circulantBackend)
+register(sparseBackend)
+register(freqSubsetBackend)
+register(lowRankBackend)
+register(factorBank)
+register(cacheBackend)
+
+
+def _available(cls, cohi):
+    avail = getattr(cls, 'available', None)
+    return avail is None or avail(cohi)
+
+
+def get(backend, cohi=None):
+    """
+    Return the backend `backend` (a backend instance, or the name of a
+    registered backend).
+
+    If the coherence object `cohi` is specified, an exception is
+    raised if it does not support the (named) backend.
+    """
+    if not isinstance(backend, basestring):
+        return backend
+    if backend not in registry:
+        raise Exception("Unknown coherence backend '%s' (available "
+                        "backends: %s)." % (backend, ', '.join(registry)))
+    cls = registry[backend]
+    if cohi is not None and (backend not in cohi.backends or
+                             not _available(cls, cohi)):
+        raise Exception("The '%s' coherence backend is not supported by "
+                        "this coherence object (%s)." %
+                        (backend, cohi.__class__.__name__))
+    return cls()
+
+
+def available_memory(cohi):
+    """
+    The memory available to the coherence calculations [bytes] (the
+    `max_memory` of the run, or the available system memory), or None
+    if it is unknown.
+    """
+    if cohi.max_memory is not None:
+        return cohi.max_memory
+    try:
+        with open('/proc/meminfo') as fl:
+            for ln in fl:
+                if ln.startswith('MemAvailable:'):
+                    return int(ln.split()[1]) * 1024
+    except (IOError, OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _load_bench():
+    if bench_file is None:
+        return {}
+    try:
+        with open(bench_file) as fl:
+            return json.load(fl)
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def _save_bench(data):
+    # The timings are only an optimization, so failures to store them
+    # (e.g. a read-only home directory) are ignored.
+    if bench_file is None:
+        return
+    try:
+        dr = path.dirname(bench_file)
+        if not path.isdir(dr):
+            os.makedirs(dr)
+        with open(bench_file, 'w') as fl:
+            json.dump(data, fl, indent=1, sort_keys=True)
+    except (IOError, OSError):
+        pass
+
+
+def benchmark(cohi, names):
+    """
+    Time the backends `names` on `bench_n_f` frequencies of the
+    coherence object `cohi`.
+
+    The timings are stored in `bench_file` (keyed by the coherence
+    object class, the grid size and `ncore`), so that each backend is
+    timed only once for each grid size (unless `bench_file` is None).
+
+    Returns
+    -------
+    times : dict
+            The time [s] of each backend.
+    """
+    key = '%s:%dx%d:%d' % (cohi.__class__.__name__,
+                           cohi.grid.n_z, cohi.grid.n_y, cohi.ncore)
+    data = _load_bench()
+    times = data.setdefault(key, {})
+    todo = [nm for nm in names if nm not in times]
+    if todo:
+        f = cohi.grid.f[np.linspace(0, cohi.n_f - 1, bench_n_f).astype(int)]
+        rng = random.RandomState(0)
+        ph = np.exp(2j * np.pi * rng.rand(cohi.n_p, 1, len(f)))
+        info = cohi.info
+        for nm in todo:
+            cohi.info = {}
+            tmp = np.asfortranarray(ph.astype(ts_complex))
+            t0 = time.time()
+            registry[nm]()(cohi, tmp, cohi._coh_comps[0], f)
+            times[nm] = time.time() - t0
+        cohi.info = info
+        _save_bench(data)
+    return dict([(nm, times[nm]) for nm in names])
+
+
+def select(cohi):
+    """
+    Select a backend for the coherence object `cohi` (when none is set
+    explicitly).
+
+    The factor cache is used if the coherence object has a `cache`
+    (and no tolerance, `tol`, which the cache does not support).
+    Otherwise, the candidates are the Cholesky backends (those with
+    `auto` set) that the coherence object supports, excluding the
+    dense ones if a coherence matrix does not fit in the available
+    memory. The first candidate is used for small grids (fewer than
+    `bench_min_np` points), and the fastest one in a micro-benchmark
+    (see :func:`benchmark`) is used otherwise. The candidates produce
+    the same time-series, so these do not depend on the timings.
+    """
+    if (cohi.cache is not None and cohi.tol is None and
+            'cache' in cohi.backends):
+        return cacheBackend(cohi.cache)
+    names = [nm for nm in cohi.backends
+             if getattr(registry.get(nm), 'auto', False) and
+             _available(registry[nm], cohi)]
+    if not names:
+        return numpyBackend()
+    mem = available_memory(cohi)
+    if mem is not None:
+        fits = [nm for nm in names
+                if not (getattr(registry[nm], 'dense', False) and
+                        4. * cohi.n_p ** 2 > mem)]
+        if fits:
+            names = fits
+    if len(names) == 1 or cohi.n_p < bench_min_np:
+        return registry[names[0]]()
+    times = benchmark(cohi, names)
+    return registry[min(names, key=times.get)]()
@@ -0,0 +1,169 @@
+"""
+This module defines an in-memory 'bank' of coherence factors that is
+keyed by the scaled frequency, f/U.
+
+The IEC coherence depends on the frequency only through f/uhub, and
+the NWTC coherence depends on it only through f/um (where um is the
+mean velocity of the two points). If the mean velocity is U*g(y, z),
+where the shape, g, is the same for several runs (e.g. a power-law
+profile with the same exponent and reference height), the coherence
+factor at frequency f for hub-height speed U is therefore the factor
+at frequency f*U0/U for speed U0. A sweep of mean wind speeds on
+identical grids can reuse the factors of the earlier speeds.
+
+Example usage
+-------------
+
+>>> import pyts.api as pyts
+>>> bank = pyts.cohereModels.factorBank(tol=1e-3)
+>>> for uhub in range(3, 26, 2):
+...     tsr = ...  # Define the run for this wind speed.
+...     tsr.cohere = pyts.cohereModels.iec()
+...     tsr.cohere.backend = bank
+...     tsr()
+
+"""
+from .base import pack_tril, unpack_tril, matmul_phases
+from .cache import factorCache
+from ..base import np, ts_float
+from numpy.linalg import cholesky
+from collections import OrderedDict
+
+
+class factorBank(object):
+
+    """
+    An in-memory bank of coherence factors that is keyed by the
+    scaled frequency (a coherence backend).
+
+    For each frequency the factor of the nearest scaled frequency in
+    the bank is used if the coherence it reproduces differs from that
+    of the frequency by less than `tol`. Otherwise the coherence
+    matrix is factored and the factor is added to the bank.
+
+    Parameters
+    ----------
+    tol : float, optional (1e-3)
+          The largest (absolute) difference between the coherence of a
+          frequency and the coherence of the factor that is used for
+          it. With tol=0 only factors of identical scaled frequencies
+          are reused.
+    max_size : float, optional (2e9)
+               The maximum total size of the factors in the bank
+               [bytes]. The factors of the least-recently-used
+               coherence inputs are removed when this is exceeded.
+
+    Notes
+    -----
+    The coherence object must define a `_scale_inputs` method (the
+    'iec' and 'nwtc' models do). With the default 'nwtc' coherence
+    parameters the u-component coherence decrement is uhub, so its
+    factors differ between wind speeds and are not reused.
+
+    The bank is filled in the process that runs it (i.e. it is not
+    used with the process-pool, `ncore` > 1, coherence calculations).
+
+    The backend adds the number of factored frequencies
+    ('n_factored'), the number of frequencies that reuse a factor
+    ('n_reused'), and the largest difference between the coherence of
+    a frequency and that of the factor used for it ('coh_error') to
+    the coherence object's `info`.
+
+    """
+    name = 'bank'
+    # The bank must be updated by the process that owns it.
+    parallel = False
+
+    def __init__(self, tol=1e-3, max_size=2e9):
+        self.tol = tol
+        self.max_size = max_size
+        self._entries = OrderedDict()
+
+    def __repr__(self,):
+        return ('<PyTurbSim coherence-factor bank: %d factors (%0.1f of '
+                '%0.1f MB)>' % (sum([len(ent[0]) for ent in
+                                     self._entries.values()]),
+                                self.size / 1e6, self.max_size / 1e6))
+
+    @property
+    def size(self,):
+        """
+        The total size of the factors in the bank [bytes].
+        """
+        return sum([sum([fac.nbytes for fac in ent[1]])
+                    for ent in self._entries.values()])
+
+    def clear(self,):
+        """
+        Remove all factors from the bank.
+        """
+        self._entries.clear()
+
+    @staticmethod
+    def available(cohi):
+        return cohi._scale_inputs(cohi._coh_comps[0]) is not None
+
+    def _entry(self, key):
+        """
+        The (scaled frequencies, packed factors) lists of `key`.
+        """
+        if key in self._entries:
+            ent = self._entries.pop(key)
+        else:
+            ent = ([], [])
+        # The last entry is the most recently used one.
+        self._entries[key] = ent
+        return ent
+
+    def _evict(self,):
+        while self.size > self.max_size and len(self._entries) > 1:
+            self._entries.popitem(last=False)
+
+    def __call__(self, cohi, tmp, comp, f):
+        """
+        Correlate the (stacked) phases `tmp` (np x n_rhs x nf, in
+        place) according to the coherence of component `comp` of the
+        coherence object `cohi` at the frequencies `f`.
+        """
+        inputs = cohi._scale_inputs(comp)
+        if inputs is None:
+            cohi._correlate_group(tmp, comp, f)
+            return
+        speed, inputs = inputs
+        n_p = cohi.n_p
+        svals, facs = self._entry(
+            factorCache.key(cohi.__class__.__name__,
+                            cohi.grid.y, cohi.grid.z, *inputs))
+        stats = dict(n_factored=0, n_reused=0, coh_error=0.)
+        for fs in cohi._iter_fstack(len(f)):
+            coh = cohi.calcCohMatrix(f[fs], comp)
+            fac = np.empty(coh.shape, dtype=ts_float)
+            use = np.zeros(len(coh), dtype=bool)
+            s = f[fs] / speed
+            if len(svals):
+                # The nearest scaled frequency in the bank.
+                srt = np.argsort(svals)
+                sb = np.array(svals)[srt]
+                idx = np.minimum(np.searchsorted(sb, s), len(sb) - 1)
+                lower = np.maximum(idx - 1, 0)
+                idx = np.where(np.abs(sb[lower] - s) < np.abs(sb[idx] - s),
+                               lower, idx)
+                err = np.abs(cohi.calcCohMatrix(sb[idx] * speed, comp) -
+                             coh).max(-1).max(-1)
+                use = err <= self.tol
+                for ii in np.nonzero(use)[0]:
+                    fac[ii] = unpack_tril(facs[srt[idx[ii]]], n_p)
+                if use.any():
+                    stats['coh_error'] = max(stats['coh_error'],
+                                             float(err[use].max()))
+            new = np.nonzero(~use)[0]
+            if len(new):
+                fac[new] = cholesky(coh[new])
+                for ii in new:
+                    svals.append(s[ii])
+                    facs.append(pack_tril(fac[ii]))
+            stats['n_factored'] += len(new)
+            stats['n_reused'] += int(use.sum())
+            tmp[..., fs] = matmul_phases(fac, tmp[..., fs])
+        self._evict()
+        cohi._add_info(backend=self.name, **stats)
@@ -16,8 +16,113 @@ the grid.
 
 """
 # tslib and dbg are needed externally
-from ..base import gridProps, modelBase, np, ts_float, ts_complex, calcObj
+from ..base import gridProps, modelBase, np, ts_float, ts_complex, calcObj, tslib
+from .cache import factorCache
+from . import parallel
 from numpy.linalg import cholesky
+try:
+    from scipy.sparse.csgraph import connected_components
+except ImportError:
+    connected_components = None
+
+
+def pack_tril(arr):
+    """
+    Pack the lower-triangular matrix `arr` (n x n) into a vector of
+    length n*(n+1)/2 (column-major, i.e. LAPACK's 'L' packed
+    storage).
+
+    `arr` may also be a stack of matrices (... x n x n), in which
+    case the output is (... x n*(n+1)/2).
+    """
+    return arr.swapaxes(-1, -2)[(Ellipsis, ) +
+                                np.triu_indices(arr.shape[-1])]
+
+
+def unpack_tril(packed, n):
+    """
+    Unpack the lower-triangular matrix (n x n) from its LAPACK 'L'
+    packed storage, `packed` (see :func:`pack_tril`).
+
+    `packed` may also be a stack of packed matrices (... x
+    n*(n+1)/2), in which case the output is (... x n x n).
+    """
+    out = np.zeros(packed.shape[:-1] + (n, n), dtype=packed.dtype)
+    out.swapaxes(-1, -2)[(Ellipsis, ) + np.triu_indices(n)] = packed
+    return out
+
+
+def matmul_phases(fac, phases):
+    """
+    Multiply the phases by a stack of matrices (one per frequency).
+
+    Parameters
+    ----------
+    fac : array_like(nf, np, np)
+          The matrices (e.g. Cholesky factors) for each frequency.
+    phases : array_like(np, [nrhs,] nf)
+             The phases.
+
+    Returns
+    -------
+    phases : array_like(np, [nrhs,] nf)
+             The product, `fac[ff] * phases[..., ff]`, for each
+             frequency.
+
+    Notes
+    -----
+    When `fac` is real, the real and imaginary parts of the phases
+    are multiplied as one real matrix (np x 2*nrhs), which avoids
+    the (wasted) complex arithmetic with the zero-imaginary factors.
+    """
+    shp = phases.shape
+    n_p, n_f = shp[0], shp[-1]
+    ph = np.ascontiguousarray(
+        phases.reshape((n_p, -1, n_f), order='F').transpose(2, 0, 1),
+        dtype=ts_complex)
+    if np.iscomplexobj(fac):
+        out = np.matmul(fac, ph)
+    else:
+        out = np.matmul(fac.astype(ts_float, copy=False),
+                        ph.view(ts_float)).view(ts_complex)
+    return out.transpose(1, 2, 0).reshape(shp, order='F')
+
+
+def is_uniform(x):
+    """
+    Whether the positions `x` (e.g. the grid's y or z) are uniformly
+    spaced.
+    """
+    if len(x) < 3:
+        return True
+    dx = x[1:] - x[:-1]
+    return bool(np.abs(dx - dx[0]).max() <= 1e-6 * abs(dx[0]))
+
+
+def connected_clusters(adj):
+    """
+    Find the connected clusters of the points of the graph with the
+    (symmetric, boolean) adjacency matrix `adj` (np x np).
+
+    Returns
+    -------
+    labels : array_like(np, dtype=int)
+             The cluster label of each point (0 ... n_clusters-1).
+    """
+    if connected_components is not None:
+        return connected_components(adj, directed=False)[1]
+    # Propagate the minimum label of each point's neighbors (and use
+    # 'pointer jumping') until the labels stop changing.
+    n = adj.shape[0]
+    labels = np.arange(n)
+    adj = adj | np.eye(n, dtype=bool)
+    while True:
+        new = np.where(adj, labels[None, :], n).min(1)
+        new = new[new]
+        if (new == labels).all():
+            break
+        labels = new
+    return np.unique(labels, return_inverse=True)[1]
 
 
 class cohereObj(gridProps, calcObj):
@@ -65,9 +170,8 @@ class cohereObj(gridProps, calcObj):
                                    dtype=ts_complex, order='F')
 
             for icomp in range(3):
-                for ff in range(self.n_f):
-                    for ii, jj in self._iter_inds():
-                        self._array[icomp, ii, jj] = self._array[icomp, jj, ii] = self.calcCoh(self.grid.f, icomp, ii, jj)  # nopep8
+                self._array[icomp] = self.calcCohMatrix(
+                    self.grid.f, icomp).transpose(1, 2, 0)
         return self._array
 
     @array.setter
@@ -78,12 +182,83 @@ class cohereObj(gridProps, calcObj):
     def array(self,):
         del self._array
 
+    # The coherence-factor cache (see the cohereModels.cache module).
+    # This is set by the coherence model.
+    cache = None
+    # The velocity components that are correlated by this object.
+    _coh_comps = (0, 1, 2)
+    # The maximum size [bytes] of each stack of coherence matrices
+    # (n_f x n_p x n_p) that the NumPy engine holds in memory.
+    stack_bytes = 2 ** 27
+
+    # The coherence tolerance (see cohereModelBase). This is set by the
+    # coherence model.
+    tol = None
+    # This is True for objects that correlate the phases with a tslib
+    # (OpenMP) kernel (see :meth:`_correlate_group`).
+    uses_tslib = False
+    # The coherence backend (see cohereModelBase): a backend instance,
+    # the name of a registered backend (see the backends module), or
+    # None to select one automatically. This is set by the coherence
+    # model or the tsrun.
+    backend = None
+    # The names of the (registered) backends that this object supports.
+    backends = ('numpy', 'sparse', 'fsubset', 'lowrank')
+    # The info entries that are accumulated as maxima (see _add_info).
+    _info_max = ('cutoff_freq', 'coh_error', 'bandwidth', 'max_modes')
+
     def __init__(self, tsrun):
         self.grid = tsrun.grid
         self.prof = tsrun.prof
         self.spec = tsrun.spec
         self.stress = tsrun.stress
         self.ncore = tsrun.ncore  # This is used by tslib.
+        self.max_memory = getattr(tsrun, 'max_memory', None)
+        # Information about the correlation, for the run's info.
+        self.info = {}
+
+    def _unpack_pairs(self, packed):
+        """
+        Unpack the symmetric matrix (np x np) from the packed pairwise
+        array `packed` (see :attr:`gridObj.pair_inds`).
+        """
+        ii, jj = self.grid.pair_inds
+        out = np.empty((self.n_p, self.n_p), dtype=packed.dtype)
+        out[ii, jj] = packed
+        out[jj, ii] = packed
+        return out
+
+    @property
+    def pair_dist(self,):
+        """
+        The distance between each pair of grid points (np x np).
+
+        This is unpacked from the grid's (cached) pairwise distances.
+        """
+        if not hasattr(self, '_pair_dist'):
+            self._pair_dist = self._unpack_pairs(self.grid.pair_dist)
+        return self._pair_dist
+
+    @property
+    def pair_zmean(self,):
+        """
+        The mean height of each pair of grid points (np x np).
+        """
+        if not hasattr(self, '_pair_zmean'):
+            self._pair_zmean = self._unpack_pairs(self.grid.pair_zmean)
+        return self._pair_zmean
+
+    @property
+    def pair_umean(self,):
+        """
+        The mean of the mean velocity (prof.u) of each pair of grid
+        points (np x np).
+        """
+        if not hasattr(self, '_pair_umean'):
+            u = self.grid.flatten(self.prof.u)
+            self._pair_umean = ((u[:, None] + u[None, :]) /
+                                ts_float(2)).astype(ts_float)
+        return self._pair_umean
 
     def _iter_inds(self,):
         """
@@ -94,7 +269,104 @@ class cohereObj(gridProps, calcObj):
             for ii in range(jj, self.n_p):
                 yield ii, jj
 
-    def calc_phases(self, phases):
+    def _iter_fstack(self, n_f):
+        """
+        An iterator for the blocks (slices) of `n_f` frequencies in
+        which the stacks of coherence matrices are computed (see
+        :attr:`stack_bytes`).
+        """
+        n_stk = max(int(self.stack_bytes // (4 * self.n_p ** 2)), 1)
+        for i0 in range(0, n_f, n_stk):
+            yield slice(i0, min(i0 + n_stk, n_f))
+
+    def _coh_groups(self,):
+        """
+        Group the components (in :attr:`_coh_comps`) that have
+        identical coherence, i.e. identical :meth:`_cache_inputs`.
+
+        Returns
+        -------
+        groups : list of lists
+                 The components of each group. The coherence matrix of
+                 each group only needs to be factored once.
+        """
+        groups = []
+        keys = []
+        for icomp in self._coh_comps:
+            inputs = self._cache_inputs(icomp)
+            if inputs is not None:
+                key = factorCache.key(*inputs)
+                if key in keys:
+                    groups[keys.index(key)].append(icomp)
+                    continue
+            else:
+                key = None
+            keys.append(key)
+            groups.append([icomp])
+        return groups
+
+    @staticmethod
+    def _stack_comps(phases, comps):
+        """
+        Stack the phases of the components `comps` as right-hand sides
+        (np x n_rhs x nf), so that a shared factorization can be
+        applied to them at once (see :meth:`_unstack_comps`).
+        """
+        n_p, n_f = phases.shape[1], phases.shape[-1]
+        n_r = phases[0].size // (n_p * n_f)
+        out = np.empty((n_p, len(comps) * n_r, n_f),
+                       dtype=ts_complex, order='F')
+        for idx, icomp in enumerate(comps):
+            out[:, idx * n_r:(idx + 1) * n_r] = phases[icomp].reshape(
+                (n_p, n_r, n_f), order='F')
+        return out
+
+    @staticmethod
+    def _unstack_comps(stacked, phases, comps):
+        """
+        Copy the stacked phases (see :meth:`_stack_comps`) back into
+        `phases`.
+        """
+        n_r = stacked.shape[1] // len(comps)
+        for idx, icomp in enumerate(comps):
+            phases[icomp] = stacked[:, idx * n_r:(idx + 1) * n_r].reshape(
+                phases.shape[1:], order='F')
+
+    def calcCohMatrix(self, f, comp):
+        """
+        Compute the coherence matrix of velocity component `comp` for
+        each of the frequencies `f`.
+
+        Parameters
+        ----------
+        f : array_like(nf)
+            The frequencies.
+        comp : int {0,1,2}
+               The velocity component.
+
+        Returns
+        -------
+        coh : array_like(nf, np, np)
+              The stack of coherence matrices.
+
+        Notes
+        -----
+        By default this calls :meth:`calcCoh` (with the vector of
+        frequencies) for each grid-point pair.  Subclasses should
+        overwrite this method with a vectorized version, e.g. using
+        the :attr:`pair_dist`, :attr:`pair_zmean` and
+        :attr:`pair_umean` matrices.
+        """
+        out = np.empty((len(f), self.n_p, self.n_p), dtype=ts_float)
+        for ii, jj in self._iter_inds():
+            if ii == jj:
+                out[:, ii, ii] = 1
+            else:
+                out[:, ii, jj] = out[:, jj, ii] = self.calcCoh(
+                    f, comp, ii, jj)
+        return out
+
+    def calc_phases(self, phases, fslice=slice(None)):
         """
         Compute the `correlated phases` for each grid-point from the
         input `phases` based on the coherence function of this
@@ -102,9 +374,15 @@ class cohereObj(gridProps, calcObj):
 
         Parameters
         ----------
-        phases : array_like(np,nf)
+        phases : array_like(3,np,[nrhs,]nf)
                  The input (generally randomized) phases for each
-                 point for each frequency.
+                 point for each frequency. The optional `nrhs`
+                 dimension holds independent sets of phases (e.g. for
+                 different random seeds) that are correlated with the
+                 same factorization.
+        fslice : slice, optional
+                 The block of frequencies (a slice into `grid.f`) that
+                 `phases` corresponds to (default: all frequencies).
 
         Returns
         -------
@@ -118,29 +396,292 @@ class cohereObj(gridProps, calcObj):
         This method should not be called explicitly.  It is called by
         a cohereObj instance's __call__ method.
 
-        This routine utilizes a model's 'calcCoh' method, which must
-        be defined explicitly for all sub-classes of this class.
+        The phases of each group of components with identical
+        coherence (see :meth:`_coh_groups`) are correlated by
+        the coherence `backend`. If no backend is set, one of the
+        `backends` that this object supports is selected automatically
+        (see :func:`.backends.select`). By default this is the tslib
+        kernel, or the batched NumPy engine (:meth:`_correlate_numpy`),
+        which utilizes a model's 'calcCohMatrix' method (or 'calcCoh'
+        method, which must be defined explicitly for all sub-classes
+        of this class): the coherence matrices of blocks of
+        frequencies are factored with a batched (stacked) Cholesky
+        decomposition. When `ncore` > 1 (and the backend does not use
+        tslib), the frequencies are split into bands that are
+        correlated in parallel by worker processes (see the
+        :mod:`.parallel` module).
+
+        If a tolerance, `tol`, is set, the coherence below `tol` is
+        neglected (see :meth:`_correlate_group_tol`). An exception is
+        raised if the backend replaces this method (e.g. the factor
+        cache), because it can not neglect the coherence.
 
         See also
         --------
         calcCoh : computes the coherence for individual grid-point pairs.
 
         """
-        out = np.zeros((self.n_comp, self.n_p, self.n_f),
-                       dtype=ts_complex, order='F')
-        tmp = np.empty((self.n_p, self.n_p),
+        backend = self._get_backend()
+        if hasattr(backend, 'calc_phases'):
+            if self.tol is not None:
+                raise Exception("The '%s' coherence backend does not "
+                                "support a tolerance (tol=%g)." %
+                                (getattr(backend, 'name', backend),
+                                 self.tol))
+            return backend.calc_phases(self, phases, fslice)
+        if (self.ncore > 1 and getattr(backend, 'parallel', True) and
+                parallel.available and phases.shape[-1] > 1):
+            return parallel.calc_phases(self, phases, fslice, self.ncore)
+        return self._calc_phases_serial(phases, fslice)
+
+    def _calc_phases_serial(self, phases, fslice=slice(None)):
+        """
+        Correlate `phases` (in place) one group of components at a
+        time (see :meth:`calc_phases`).
+        """
+        f = self.grid.f[fslice]
+        for comps in self._coh_groups():
+            tmp = self._stack_comps(phases, comps)
+            if self.tol is None:
+                self._correlate(tmp, comps[0], f)
+            else:
+                self._correlate_group_tol(tmp, comps[0], f)
+            self._unstack_comps(tmp, phases, comps)
+        return phases
+
+    def _get_backend(self,):
+        """
+        The coherence backend of this object (the `backend`, or the
+        one selected by :func:`.backends.select` if it is None).
+        """
+        if getattr(self, '_backend', None) is None:
+            from . import backends
+            if self.backend is None:
+                self._backend = backends.select(self)
+            else:
+                self._backend = backends.get(self.backend, self)
+        return self._backend
+
+    def _correlate(self, tmp, comp, f):
+        """
+        Correlate the (stacked) phases `tmp` with this object's
+        backend (see :meth:`_get_backend`).
+        """
+        self._get_backend()(self, tmp, comp, f)
+
+    def _correlate_group(self, tmp, comp, f):
+        """
+        Correlate the (stacked) phases `tmp` (np x n_rhs x nf, in
+        place) according to the coherence of component `comp` at the
+        frequencies `f` with a dense Cholesky factorization.
+
+        This is the batched NumPy engine (:meth:`_correlate_numpy`)
+        unless a subclass overwrites it with a faster (e.g. tslib)
+        kernel.
+        """
+        self._correlate_numpy(tmp, comp, f)
+
+    def _correlate_numpy(self, tmp, comp, f):
+        """
+        The batched NumPy engine: correlate the (stacked) phases `tmp`
+        (see :meth:`_correlate_group`) with stacks of Cholesky factors.
+        """
+        for fs in self._iter_fstack(len(f)):
+            fac = cholesky(self.calcCohMatrix(f[fs], comp))
+            tmp[..., fs] = matmul_phases(fac, tmp[..., fs])
+
+    def _pair_fcut(self, comp):
+        """
+        The frequency above which the coherence of each pair of
+        points is less than `tol` (np x np).
+
+        This returns None unless it is defined by a subclass, in
+        which case the coherence is compared to `tol` explicitly.
+        """
+        return None
+
+    def _coh_adjacency(self, comp, f):
+        """
+        Return the 'adjacency' of the points (nf x np x np, boolean)
+        at the frequencies `f`, i.e. where the coherence of component
+        `comp` is at least `tol`.
+        """
+        fcut = self._pair_fcut(comp)
+        if fcut is None:
+            return self.calcCohMatrix(f, comp) >= self.tol
+        return fcut[None, :, :] >= np.array(f, ndmin=1)[:, None, None]
+
+    def _correlate_group_tol(self, tmp, comp, f):
+        """
+        Correlate the (stacked) phases `tmp` (see
+        :meth:`_correlate_group`), neglecting coherence below `tol`.
+
+        At each frequency the points are divided into clusters that
+        are connected by coherence >= `tol`. The phases of points
+        that are not coherent with any other point are left
+        untouched, and the coherence of each cluster is factored
+        separately. Frequencies at which all points are connected are
+        correlated by :meth:`_correlate_group`.
+        """
+        n_f = len(f)
+        diag = np.arange(self.n_p)
+        # Divide the frequencies into runs with the same clusters.
+        runs = []
+        last = None
+        for fs in self._iter_fstack(n_f):
+            adj = self._coh_adjacency(comp, f[fs])
+            for idx in range(adj.shape[0]):
+                adj_f = adj[idx]
+                adj_f[diag, diag] = False
+                if last is not None and (adj_f == last).all():
+                    runs[-1][1] += 1
+                    continue
+                if not adj_f.any():
+                    labels = None
+                else:
+                    labels = connected_clusters(adj_f)
+                ff = fs.start + idx
+                runs.append([ff, ff + 1, labels])
+                last = adj_f
+        n_skip = n_clust = 0
+        f_cut = 0
+        for i0, i1, labels in runs:
+            if labels is None:
+                # No coherence above tol: the phases are unchanged.
+                n_skip += i1 - i0
+                continue
+            f_cut = max(f_cut, f[i1 - 1])
+            if labels.max() == 0:
+                self._correlate(tmp[..., i0:i1], comp, f[i0:i1])
+                continue
+            n_clust += i1 - i0
+            for lbl in range(labels.max() + 1):
+                idx = np.where(labels == lbl)[0]
+                if len(idx) == 1:
+                    continue
+                for fs in self._iter_fstack(i1 - i0):
+                    fs = slice(i0 + fs.start, i0 + fs.stop)
+                    coh = self.calcCohMatrix(f[fs], comp)[:, idx][:, :, idx]
+                    tmp[idx, :, fs] = matmul_phases(cholesky(coh),
+                                                    tmp[idx][..., fs])
+        self._add_info(tol=self.tol, n_freq=n_f, n_skipped=n_skip,
+                       n_clustered=n_clust, cutoff_freq=f_cut)
+
+    def _add_info(self, **kwargs):
+        """
+        Accumulate information about the correlation (e.g. the
+        tolerance statistics, see :meth:`_correlate_group_tol`) in this
+        object's `info`. The 'n_*' (counts) and 't_*' (times)
+        entries are summed, the `_info_max` entries are maximized and
+        other entries are replaced.
+        """
+        info = self.info
+        for nm, val in kwargs.items():
+            if nm.startswith('n_') or nm.startswith('t_'):
+                info[nm] = info.get(nm, 0) + val
+            elif nm in self._info_max:
+                info[nm] = max(info.get(nm, val), val)
+            else:
+                info[nm] = val
+        if info.get('n_freq'):
+            info['skipped_fraction'] = (float(info['n_skipped']) /
+                                        info['n_freq'])
+        if info.get('n_kept'):
+            info['fill_ratio'] = float(info['n_band']) / info['n_kept']
+        if info.get('n_freq_lowrank'):
+            info['mean_modes'] = (float(info['n_modes']) /
+                                  info['n_freq_lowrank'])
+        if info.get('t_lowrank'):
+            info['speedup'] = info['t_cholesky'] / info['t_lowrank']
+
+    def _scale_inputs(self, comp):
+        """
+        Return the speed, U, by which the frequency is scaled, and
+        the inputs (other than the grid) that determine the coherence
+        of component `comp` as a function of f/U. These define the
+        key of the factors in a :class:`factorBank
+        <pyts.cohereModels.bank.factorBank>`.
+
+        This returns None (the coherence does not scale) unless it is
+        defined by a subclass.
+        """
+        return None
+
+    def _cache_inputs(self, comp):
+        """
+        Return the inputs (other than the grid and frequencies) that
+        determine the coherence of component `comp`. These define the
+        cache key of the coherence factors.
+
+        This returns None (the factors are not cached) unless it is
+        defined by a subclass.
+        """
+        return None
+
+    def _calc_phases_cached(self, phases, fslice=slice(None), cache=None):
+        """
+        Compute the correlated phases (see :meth:`calc_phases`) using
+        factors from (or stored in) the factor `cache` (default: this
+        object's cache).
+        """
+        if cache is None:
+            cache = self.cache
+        f = self.grid.f[fslice]
+        for comps in self._coh_groups():
+            inputs = self._cache_inputs(comps[0])
+            if inputs is None:
+                fac = self.calc_factors(comps[0], fslice)
+            else:
+                key = cache.key(self.__class__.__name__,
+                                self.grid.y, self.grid.z, f, *inputs)
+                fac = cache.get(key)
+                if fac is None:
+                    fac = self.calc_factors(comps[0], fslice)
+                    cache.put(key, fac)
+            tmp = self.apply_factors(fac, self._stack_comps(phases, comps))
+            self._unstack_comps(tmp, phases, comps)
+        return phases
+
+    def calc_factors(self, comp, fslice=slice(None)):
+        """
+        Compute the Cholesky factors of the coherence matrix of
+        component `comp` for the frequencies `grid.f[fslice]`.
+
+        Returns
+        -------
+        fac : array_like(np*(np+1)/2, nf)
+              The packed lower-triangular factors (see
+              :func:`pack_tril`) for each frequency.
+
+        """
+        f = self.grid.f[fslice]
+        out = np.empty((self.n_p * (self.n_p + 1) // 2, len(f)),
                        dtype=ts_float, order='F')
-        for icomp in range(3):
-            for ff in range(self.n_f):
-                for ii, jj in self._iter_inds():
-                    if ii == jj:
-                        tmp[ii, ii] = 1
-                    else:
-                        tmp[ii, jj] = tmp[jj, ii] = self.calcCoh(
-                            self.grid.f[ff],
-                            icomp, ii, jj)
-                tmp[:] = cholesky(tmp)
-                out[icomp, :, ff] = (tmp * phases[icomp, :, ff]).sum(-1)
+        for fs in self._iter_fstack(len(f)):
+            out[:, fs] = pack_tril(
+                cholesky(self.calcCohMatrix(f[fs], comp))).T
+        return out
+
+    def apply_factors(self, fac, phases):
+        """
+        Apply the packed Cholesky factors `fac` (see
+        :meth:`calc_factors`) to `phases` (np x [nrhs x] nf).
+
+        Returns
+        -------
+        phases : array_like(np, [nrhs,] nf)
+                 The correlated phases.
+        """
+        n_f = fac.shape[-1]
+        out = np.empty(phases.shape, dtype=ts_complex, order='F')
+        out[:] = phases
+        if tslib is not None:
+            tslib.cohapply(out.reshape((self.n_p, -1, n_f), order='F'),
+                           fac, self.ncore)
+        else:
+            for fs in self._iter_fstack(n_f):
+                out[..., fs] = matmul_phases(
+                    unpack_tril(fac[:, fs].T, self.n_p), phases[..., fs])
         return out
 
     def calcCoh(self, f, comp, ii, jj):
@@ -193,24 +734,25 @@ class cohereUser(cohereObj):
 
     def __init__(self, array):
         self.array = array
+        # (see cohereObj.__init__)
+        self.info = {}
 
-    def calc_phases(self, phases):
+    def calc_phases(self, phases, fslice=slice(None)):
         """
-        Compute and set the full cross-spectral matrix for component
-        *comp* for 'coherence calculator' instance *cohi*.
+        Compute the correlated phases from the input `phases` using
+        the Cholesky factorization of the coherence array of this
+        object (for the block of frequencies `fslice`).
 
         This method should not be called explicitly.  It is called by
         a 'coherence calculator' instance's __call__ method.
 
-        This routine utilizes a model's 'calcCoh' method, which must
-        be defined explicitly for all sub-classes of cohereModelBase.
-
         """
-        tmp = np.empty((self.n_p, self.n_p), dtype=ts_float, order='F')
-        for ff in np.range(self.n_f):
-            tmp[:] = cholesky(self.array[comp, :, :, ff])
-            for ii in range(self.n_p):
-                coh[ii, ff] = (tmp * phases[:, ff]).sum(-1) 
+        array = self.array[..., fslice]
+        out = np.zeros(phases.shape, dtype=ts_complex, order='F')
+        for icomp in range(array.shape[0]):
+            fac = cholesky(array[icomp].transpose(2, 0, 1))
+            out[icomp] = matmul_phases(fac, phases[icomp])
+        return out
 
 
 class cohereModelBase(modelBase, gridProps):
@@ -237,6 +779,18 @@ class cohereModelBase(modelBase, gridProps):
     """
     cohereObj = cohereObj  # This needs to be set to the appropriate
                            # 'coherence object' for each model.
+    # Set this to a cache.factorCache instance to store and reuse the
+    # coherence factors of this model on disk.
+    cache = None
+    # Set this to a (small) value, epsilon, to neglect coherence below
+    # epsilon: frequencies at which the coherence of all point-pairs
+    # is below epsilon are not correlated, and only the clusters of
+    # coherent points are correlated at other frequencies.
+    tol = None
+    # Set this to a coherence 'backend' (e.g. sparse.sparseBackend, or
+    # the name of a registered backend, e.g. 'numpy') to replace the
+    # automatically selected one (see the backends module).
+    backend = None
 
     def __call__(self, tsrun):
         """
@@ -267,6 +821,16 @@ class cohereModelBase(modelBase, gridProps):
 
         """
         out = self.cohereObj(tsrun)
+        if self.cache is not None:
+            out.cache = self.cache
+        if self.tol is not None:
+            out.tol = self.tol
+        # The backend of the run overrides that of the model.
+        backend = getattr(tsrun, 'cohere_backend', None)
+        if backend is None:
+            backend = self.backend
+        if backend is not None:
+            out.backend = backend
         if hasattr(self, 'set_coefs'):
             self.set_coefs(out)
         return out
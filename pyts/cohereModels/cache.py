@@ -0,0 +1,157 @@
+"""
+This module defines the on-disk cache of coherence factors.
+
+The Cholesky factors of the coherence matrix depend only on the grid,
+the frequencies, the coherence-model parameters and the mean
+profile. They do not depend on the random seed, the spectral model or
+the stress model. Repeated runs on the same grid with the same
+coherence inputs can therefore reuse the factors computed by previous
+runs.
+
+Example usage
+-------------
+
+>>> import pyts.api as pyts
+>>> cm = pyts.cohereModels.nwtc()
+>>> cm.cache = pyts.cohereModels.factorCache(max_size=20e9)
+
+"""
+from ..base import np, userroot
+from os import path
+import hashlib
+import os
+
+default_cache_dir = path.join(userroot, '.pyts', 'factor_cache')
+
+
+class factorCache(object):
+
+    """
+    A content-addressed, size-bounded (least-recently-used) cache of
+    coherence factors.
+
+    Each entry is a float32 array of packed, lower-triangular
+    Cholesky factors (n_p*(n_p+1)/2 x n_f, Fortran order) for a block
+    of frequencies. Entries are stored as .npy files and are loaded
+    as read-only memory-maps.
+
+    Parameters
+    ----------
+    directory : str, optional
+                The directory in which to store the cache files
+                (default: ~/.pyts/factor_cache).
+    max_size : float, optional (10e9)
+               The maximum total size of the cache files [bytes].
+               The least-recently-used entries are removed when this
+               is exceeded.
+
+    """
+    suffix = '.npy'
+
+    def __init__(self, directory=None, max_size=10e9):
+        if directory is None:
+            directory = default_cache_dir
+        self.directory = directory
+        self.max_size = max_size
+        if not path.isdir(directory):
+            os.makedirs(directory)
+
+    def __repr__(self,):
+        return ('<PyTurbSim coherence-factor cache: %s (%0.1f of %0.1f MB)>' %
+                (self.directory, self.size / 1e6, self.max_size / 1e6))
+
+    @staticmethod
+    def key(*inputs):
+        """
+        Compute the cache key (a hash) of `inputs`.
+
+        The inputs may be arrays, numbers or strings. Arrays are
+        hashed by their dtype, shape and data.
+        """
+        hsh = hashlib.sha1()
+        for val in inputs:
+            if isinstance(val, np.ndarray):
+                val = np.ascontiguousarray(val)
+                hsh.update(('%s%s' % (val.dtype.str, val.shape)).encode())
+                hsh.update(val.tobytes())
+            else:
+                hsh.update(repr(val).encode())
+            hsh.update(b'|')
+        return hsh.hexdigest()
+
+    def _fname(self, key):
+        return path.join(self.directory, key + self.suffix)
+
+    def __contains__(self, key):
+        return path.isfile(self._fname(key))
+
+    def get(self, key):
+        """
+        Return the factors for `key` (as a read-only memory-map), or
+        None if they are not in the cache.
+        """
+        fname = self._fname(key)
+        try:
+            out = np.load(fname, mmap_mode='r')
+        except (IOError, OSError, ValueError):
+            return None
+        # Update the modification time, which tracks the 'last use'.
+        os.utime(fname, None)
+        return out
+
+    def put(self, key, fac):
+        """
+        Store the factors `fac` in the cache with `key`.
+        """
+        fname = self._fname(key)
+        # Write to a temporary file and rename it so that concurrent
+        # runs never load a partially written file.
+        tmpname = '%s.%d.tmp' % (fname, os.getpid())
+        with open(tmpname, 'wb') as fl:
+            np.save(fl, np.asfortranarray(fac))
+        os.rename(tmpname, fname)
+        self.evict()
+
+    def _entries(self,):
+        out = []
+        for fname in os.listdir(self.directory):
+            if not fname.endswith(self.suffix):
+                continue
+            fname = path.join(self.directory, fname)
+            try:
+                st = os.stat(fname)
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, fname))
+        return out
+
+    @property
+    def size(self,):
+        """
+        The total size of the cache files [bytes].
+        """
+        return sum([ent[1] for ent in self._entries()])
+
+    def evict(self, max_size=None):
+        """
+        Remove the least-recently-used entries until the size of the
+        cache is less than `max_size` (default: self.max_size).
+        """
+        if max_size is None:
+            max_size = self.max_size
+        entries = sorted(self._entries())
+        size = sum([ent[1] for ent in entries])
+        for mtime, fsize, fname in entries:
+            if size <= max_size:
+                break
+            try:
+                os.remove(fname)
+            except OSError:
+                continue
+            size -= fsize
+
+    def clear(self,):
+        """
+        Remove all entries from the cache.
+        """
+        self.evict(0)
@@ -0,0 +1,167 @@
+"""
+This module defines a circulant-embedding coherence backend for
+coherence models that depend only on the separation of the points
+(e.g. the IEC model).
+
+On a regular grid, the coherence matrix of such a model is
+block-Toeplitz with Toeplitz blocks at each frequency. It is embedded
+in a (larger) block-circulant matrix, which is diagonalized by the 2-D
+FFT. If the eigenvalues of the embedding are non-negative, the
+correlated phases are synthesized with one FFT of the embedding
+(O(n_p log n_p) operations per frequency) rather than with a dense
+(O(n_p^3)) Cholesky factorization. The embedding is doubled in size
+when it has negative eigenvalues, and the coherence matrix is factored
+(Cholesky) when the larger embedding is also not positive
+semi-definite.
+
+"""
+from .base import is_uniform
+from ..base import np, ts_complex
+from numpy import fft, random
+import zlib
+
+
+class circulantBackend(object):
+
+    """
+    A circulant-embedding coherence backend.
+
+    The coherence object must define a `calcCohDist` method, which
+    returns the coherence as a function of the separation of the
+    points (see :meth:`cohereObjIEC.calcCohDist
+    <pyts.cohereModels.main.cohereObjIEC.calcCohDist>`).
+
+    Parameters
+    ----------
+    neg_tol : float, optional (1e-8)
+              Negative eigenvalues of the embedding that are smaller
+              (in magnitude) than this fraction of the largest
+              eigenvalue are set to zero. The embedding is not
+              positive semi-definite if it has larger negative
+              eigenvalues.
+
+    Notes
+    -----
+    The embedding has more points than the grid, so the synthesis
+    needs more random phases than the phase model provides. The
+    additional phases are drawn from a random stream that is seeded by
+    the phases of the grid points (at each frequency), so that they
+    differ between runs (and random seeds) and do not depend on the
+    block size.
+
+    The velocity time-series therefore differ from those of the
+    default (Cholesky) backend for the same random seed, although
+    their statistics (the coherence) are the same. This backend is
+    therefore never selected automatically (see :func:`backends.select
+    <pyts.cohereModels.backends.select>`); set it as the `backend` of
+    the coherence model to use it.
+
+    The grid must be uniformly spaced in y and z.
+
+    The backend adds the number of frequencies that are synthesized
+    from the embedding ('n_circulant'), from the doubled embedding
+    ('n_padded'), and with the Cholesky factor ('n_dense_fallback')
+    to the coherence object's `info`.
+
+    Examples
+    --------
+    >>> cm = pyts.cohereModels.iec()
+    >>> cm.backend = pyts.cohereModels.circulantBackend()
+
+    """
+    name = 'circulant'
+    # The maximum number of eigenvalues that are computed at a time.
+    stack_size = 2 ** 22
+
+    def __init__(self, neg_tol=1e-8):
+        self.neg_tol = neg_tol
+
+    def __repr__(self,):
+        return ('<PyTurbSim circulant-embedding coherence backend '
+                '(neg_tol={})>'.format(self.neg_tol))
+
+    @staticmethod
+    def available(cohi):
+        return (hasattr(cohi, 'calcCohDist') and
+                is_uniform(cohi.grid.y) and is_uniform(cohi.grid.z))
+
+    @staticmethod
+    def _embed_dist(x, n_embed):
+        """
+        The distances (on the 'torus') between the first point and
+        each point of the embedding, for the (uniformly spaced) grid
+        positions `x`.
+        """
+        if len(x) < 2:
+            return np.zeros(n_embed)
+        k = np.arange(n_embed)
+        return np.minimum(k, n_embed - k) * float(x[1] - x[0])
+
+    def _eigvals(self, cohi, comp, f, scale):
+        """
+        The eigenvalues (nf x n_ez x n_ey) of the embedding of the
+        coherence of component `comp` at the frequencies `f`. The
+        embedding is `scale` times the size of the minimal one.
+        """
+        grid = cohi.grid
+        n_ez = max(2 * (grid.n_z - 1), 1) * scale
+        n_ey = max(2 * (grid.n_y - 1), 1) * scale
+        dz = self._embed_dist(grid.z, n_ez)
+        dy = self._embed_dist(grid.y, n_ey)
+        r = np.sqrt(dz[:, None] ** 2 + dy[None, :] ** 2)
+        lam = fft.fft2(cohi.calcCohDist(f, comp, r)).real
+        lam_max = lam.max(-1).max(-1)
+        ok = lam.min(-1).min(-1) >= -self.neg_tol * lam_max
+        lam[lam < 0] = 0
+        return lam, ok
+
+    def _synthesize(self, cohi, lam, ph):
+        """
+        Synthesize the correlated phases (np x n_rhs) at one
+        frequency from the eigenvalues `lam` of the embedding and the
+        input phases `ph` (np x n_rhs, these are replaced).
+        """
+        grid = cohi.grid
+        n_ez, n_ey = lam.shape
+        n_rhs = ph.shape[1]
+        rng = random.RandomState(zlib.crc32(ph.tobytes()) & 0xffffffff)
+        xi = np.exp(2j * np.pi * rng.rand(n_ez, n_ey, n_rhs))
+        xi[:grid.n_z, :grid.n_y] = ph.reshape((grid.n_z, grid.n_y, n_rhs))
+        xi *= np.sqrt(lam / lam.size)[:, :, None]
+        out = fft.fft2(xi, axes=(0, 1))[:grid.n_z, :grid.n_y]
+        ph[:] = out.reshape((grid.n_p, n_rhs)).astype(ts_complex)
+
+    def __call__(self, cohi, tmp, comp, f):
+        """
+        Correlate the (stacked) phases `tmp` (np x n_rhs x nf, in
+        place) according to the coherence of component `comp` of the
+        coherence object `cohi` at the frequencies `f`.
+        """
+        if not hasattr(cohi, 'calcCohDist'):
+            raise Exception("The circulant-embedding backend requires a "
+                            "coherence model that depends only on the "
+                            "separation of the points (e.g. 'iec').")
+        if not self.available(cohi):
+            raise Exception("The circulant-embedding backend requires a "
+                            "grid that is uniformly spaced in y and z.")
+        stats = dict(n_circulant=0, n_padded=0, n_dense_fallback=0)
+        n_embed = (max(2 * (cohi.grid.n_z - 1), 1) *
+                   max(2 * (cohi.grid.n_y - 1), 1))
+        n_stack = max(self.stack_size // n_embed, 1)
+        for i0 in range(0, len(f), n_stack):
+            i1 = min(i0 + n_stack, len(f))
+            lam, ok = self._eigvals(cohi, comp, f[i0:i1], 1)
+            for idx in range(i0, i1):
+                if ok[idx - i0]:
+                    stats['n_circulant'] += 1
+                    self._synthesize(cohi, lam[idx - i0], tmp[..., idx])
+                    continue
+                lam2, ok2 = self._eigvals(cohi, comp, f[idx:idx + 1], 2)
+                if ok2[0]:
+                    stats['n_padded'] += 1
+                    self._synthesize(cohi, lam2[0], tmp[..., idx])
+                else:
+                    stats['n_dense_fallback'] += 1
+                    cohi._correlate_group(tmp[..., idx:idx + 1], comp,
+                                          f[idx:idx + 1])
+        cohi._add_info(backend=self.name, **stats)
@@ -0,0 +1,128 @@
+"""
+This module defines a coherence backend that factors the coherence
+matrix on an (adaptively chosen) subset of the frequencies.
+
+The coherence matrix varies smoothly with frequency, so the Cholesky
+factor of one frequency reproduces the coherence of the neighboring
+frequencies closely. This backend divides the frequencies into
+segments in which the coherence differs from that of one 'anchor'
+frequency by less than a tolerance, and correlates the phases of each
+segment with the factor of its anchor.
+
+The coherence that is reproduced at each frequency is exactly that of
+its anchor, so the largest difference between the coherence of a
+frequency and that of its anchor is a strict bound on the error of the
+reproduced coherence. This bound is reported in the coherence
+object's info ('coh_error').
+
+"""
+from ..base import np, ts_float
+from numpy.linalg import cholesky
+
+
+class freqSubsetBackend(object):
+
+    """
+    A coherence backend that factors the coherence on a subset of the
+    frequencies.
+
+    Parameters
+    ----------
+    tol : float, optional (1e-3)
+          The largest (absolute) difference between the coherence of
+          a frequency and that of the frequency whose factor is used
+          for it.
+
+    Notes
+    -----
+    The segments do not span the blocks of frequencies (see the
+    `block_size` of :class:`tsrun <pyts.main.tsrun>`) or the stacks of
+    frequencies whose coherence is computed at once (see
+    :attr:`cohereObj.stack_bytes <pyts.cohereModels.base.cohereObj.stack_bytes>`).
+
+    The backend adds the number of factored frequencies
+    ('n_factored'), the number of frequencies that reuse a factor
+    ('n_reused'), and the bound on the error in the reproduced
+    coherence ('coh_error') to the coherence object's `info`.
+
+    Examples
+    --------
+    >>> cm = pyts.cohereModels.nwtc()
+    >>> cm.backend = pyts.cohereModels.freqSubsetBackend(tol=1e-3)
+
+    """
+    name = 'fsubset'
+
+    def __init__(self, tol=1e-3):
+        self.tol = tol
+
+    def __repr__(self,):
+        return ('<PyTurbSim frequency-subset coherence backend '
+                '(tol={})>'.format(self.tol))
+
+    def _first_bad(self, coh, ia, i0):
+        """
+        Return the index of the first frequency at or after `i0`
+        whose coherence differs from that of frequency `ia` by more
+        than `tol` (or the number of frequencies, if none does).
+        """
+        n_f = coh.shape[0]
+        n_chunk = 8
+        while i0 < n_f:
+            i1 = min(i0 + n_chunk, n_f)
+            bad = np.nonzero(np.abs(coh[i0:i1] - coh[ia]).max(-1).max(-1) >
+                             self.tol)[0]
+            if len(bad):
+                return i0 + int(bad[0])
+            i0 = i1
+            n_chunk *= 2
+        return n_f
+
+    def _segments(self, coh):
+        """
+        Divide the frequencies of the coherence matrices `coh` (nf x
+        np x np) into segments that use the same anchor.
+
+        Returns
+        -------
+        segs : list of (i0, i1, ia, err) tuples
+               The segment i0:i1 uses the factor of frequency ia, and
+               the coherence error of the segment is err.
+        """
+        n_f = coh.shape[0]
+        out = []
+        i0 = 0
+        while i0 < n_f:
+            # Move the anchor as far as possible from the start of the
+            # segment, then extend the segment past the anchor.
+            ia = self._first_bad(coh, i0, i0) - 1
+            dif = np.abs(coh[i0:ia + 1] - coh[ia]).max(-1).max(-1)
+            if (dif > self.tol).any():
+                # (the coherence does not vary monotonically)
+                ia = i0
+            i1 = self._first_bad(coh, ia, ia)
+            err = np.abs(coh[i0:i1] - coh[ia]).max()
+            out.append((i0, i1, ia, float(err)))
+            i0 = i1
+        return out
+
+    def __call__(self, cohi, tmp, comp, f):
+        """
+        Correlate the (stacked) phases `tmp` (np x n_rhs x nf, in
+        place) according to the coherence of component `comp` of the
+        coherence object `cohi` at the frequencies `f`.
+        """
+        stats = dict(n_factored=0, n_reused=0, coh_error=0.)
+        for fs in cohi._iter_fstack(len(f)):
+            coh = cohi.calcCohMatrix(f[fs], comp)
+            for i0, i1, ia, err in self._segments(coh):
+                fac = cholesky(coh[ia]).astype(ts_float)
+                ph = tmp[..., fs.start + i0:fs.start + i1]
+                x = ph.reshape((ph.shape[0], -1), order='F')
+                ph[:] = (np.dot(fac, x.real) +
+                         1j * np.dot(fac, x.imag)).reshape(ph.shape,
+                                                           order='F')
+                stats['n_factored'] += 1
+                stats['n_reused'] += i1 - i0 - 1
+                stats['coh_error'] = max(stats['coh_error'], err)
+        cohi._add_info(backend=self.name, **stats)
@@ -0,0 +1,173 @@
+"""
+This module defines a low-rank (truncated eigen-decomposition, or
+'proper orthogonal decomposition') coherence backend.
+
+At low frequencies nearly all points of the grid move together, so
+the coherence matrix is close to rank-deficient, and at moderate
+frequencies a few eigen-modes carry most of its trace (the variance).
+This backend computes the dominant modes of the coherence matrix at
+each frequency, keeps enough of them to reach a target fraction of
+the trace, and synthesizes the correlated phases from the modes
+(e.g. Di Paola, 1998; Carassale & Solari, 2006).
+
+The modes are computed with a (block) subspace iteration that starts
+from the modes of the previous frequency, so that each frequency
+costs O(n_p^2 k) operations for k modes, rather than O(n_p^3) for the
+Cholesky factorization. Once a frequency needs more than `max_rank`
+of the modes (at high frequencies the coherence matrix approaches the
+identity), the remaining frequencies are factored with the Cholesky
+decomposition.
+
+"""
+from ..base import np
+from numpy import linalg
+import time
+
+
+class lowRankBackend(object):
+
+    """
+    A low-rank (truncated eigen-decomposition) coherence backend.
+
+    Parameters
+    ----------
+    trace_fraction : float, optional (0.99)
+                     The fraction of the trace of the coherence matrix
+                     that the modes must capture.
+    max_rank : float, optional (0.1)
+               The largest number of modes, as a fraction of the
+               number of points. Frequencies that need more modes are
+               factored with the Cholesky decomposition.
+    n_iter : int, optional (2)
+             The number of subspace iterations at each frequency.
+
+    Notes
+    -----
+    The modes of each frequency are scaled so that the variance
+    (the diagonal of the reproduced coherence matrix) at each point is
+    one, i.e. the truncation only affects the off-diagonal coherence.
+
+    The backend adds the number of frequencies that are synthesized
+    from the modes ('n_freq_lowrank'), the mean and largest number of
+    modes ('mean_modes', 'max_modes'), the number of frequencies that
+    are factored ('n_dense_fallback') and the speedup of the
+    synthesis over the Cholesky factorization ('speedup', the
+    estimated time of the Cholesky factorization of the low-rank
+    frequencies divided by their synthesis time) to the coherence
+    object's `info`.
+
+    Examples
+    --------
+    >>> cm = pyts.cohereModels.nwtc()
+    >>> cm.backend = pyts.cohereModels.lowRankBackend(trace_fraction=0.99)
+
+    """
+    name = 'lowrank'
+    # The number of extra (over-sampled) columns of the subspace,
+    # which improve the convergence of the kept modes.
+    oversample = 4
+
+    def __init__(self, trace_fraction=0.99, max_rank=0.1, n_iter=2):
+        self.trace_fraction = trace_fraction
+        self.max_rank = max_rank
+        self.n_iter = n_iter
+
+    def __repr__(self,):
+        return ('<PyTurbSim low-rank coherence backend '
+                '(trace_fraction={})>'.format(self.trace_fraction))
+
+    def _modes(self, coh, q0, k_max):
+        """
+        Compute the dominant eigen-modes of `coh` (np x np) that
+        capture `trace_fraction` of its trace, starting from the
+        modes `q0` (np x p, or None; the kept modes and `oversample`
+        extra columns of the previous frequency).
+
+        Returns
+        -------
+        lam : array_like(p)
+              The eigenvalues (in descending order).
+        q : array_like(np, p)
+            The modes (the eigenvectors).
+        k : int
+            The number of modes to keep.
+
+        Returns None if more than `k_max` modes are needed.
+        """
+        n_p = coh.shape[0]
+        target = self.trace_fraction * np.trace(coh)
+        q = q0
+        k = 4 if q is None else max(q.shape[1] - self.oversample, 1)
+        while True:
+            p = min(k + self.oversample, n_p)
+            if q is None or q.shape[1] < p:
+                # Add (evenly spaced) columns of the coherence matrix.
+                cols = np.linspace(0, n_p - 1, p).astype(int)
+                q = coh[:, cols] if q is None else \
+                    np.concatenate((q, coh[:, cols[:p - q.shape[1]]]), 1)
+            elif q.shape[1] > p:
+                q = q[:, :p]
+            for itr in range(self.n_iter):
+                q = linalg.qr(np.dot(coh, q))[0]
+            lam, w = linalg.eigh(np.dot(q.T, np.dot(coh, q)))
+            lam, w = lam[::-1], w[:, ::-1]
+            q = np.dot(q, w)
+            cum = np.cumsum(lam)
+            if cum[-1] >= target or p == n_p:
+                k = min(int(np.searchsorted(cum, target)) + 1, p)
+                if k > k_max:
+                    return None
+                return lam, q, k
+            k *= 2
+            if k > k_max:
+                return None
+
+    def __call__(self, cohi, tmp, comp, f):
+        """
+        Correlate the (stacked) phases `tmp` (np x n_rhs x nf, in
+        place) according to the coherence of component `comp` of the
+        coherence object `cohi` at the frequencies `f`.
+        """
+        n_p = cohi.n_p
+        k_max = max(int(self.max_rank * n_p), 1)
+        stats = dict(n_freq_lowrank=0, n_modes=0, max_modes=0,
+                     n_dense_fallback=0, t_lowrank=0., t_cholesky=0.)
+        q = None
+        dense = False
+        t_chol = None
+        for fs in cohi._iter_fstack(len(f)):
+            coh = cohi.calcCohMatrix(f[fs], comp).astype(np.float64)
+            for idx in range(len(coh)):
+                ph = tmp[..., fs.start + idx]
+                if not dense:
+                    t0 = time.time()
+                    out = self._modes(coh[idx], q, k_max)
+                    if out is not None:
+                        lam, q, k = out
+                        amp = q[:, :k] * np.sqrt(np.maximum(lam[:k], 0))
+                        amp /= np.sqrt((amp ** 2).sum(1))[:, None]
+                        ph[:] = np.dot(amp, np.dot(q[:, :k].T, ph))
+                        # Only the kept modes (and the over-sampled
+                        # columns) start the next frequency, so that the
+                        # subspace does not grow.
+                        q = q[:, :k + self.oversample]
+                        stats['t_lowrank'] += time.time() - t0
+                        stats['n_freq_lowrank'] += 1
+                        stats['n_modes'] += k
+                        stats['max_modes'] = max(stats['max_modes'], k)
+                        continue
+                    # The remaining frequencies are factored.
+                    dense = True
+                t0 = time.time()
+                ph[:] = np.dot(linalg.cholesky(coh[idx]), ph)
+                if t_chol is None:
+                    t_chol = time.time() - t0
+                stats['n_dense_fallback'] += 1
+        if stats['n_freq_lowrank']:
+            if t_chol is None:
+                # Time the Cholesky factorization of one frequency.
+                t0 = time.time()
+                np.dot(linalg.cholesky(coh[-1]), tmp[..., -1])
+                t_chol = time.time() - t0
+            stats['t_cholesky'] = t_chol * stats['n_freq_lowrank']
+        cohi._add_info(backend=self.name, **stats)
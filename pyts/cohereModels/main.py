@@ -15,7 +15,7 @@ class cohereObjNone(cohereObj):
     zero.
     """
 
-    def calc_phases(self, phases):
+    def calc_phases(self, phases, fslice=slice(None)):
         return phases
 
     def calcCoh(self, f, comp, ii, jj):
@@ -33,48 +33,113 @@ class none(cohereModelBase):
 
 class cohereObjNWTC(cohereObj):
 
-    def calc_phases(self, phases):
+    uses_tslib = tslib is not None
+    backends = ('tslib', 'numpy', 'toeplitz', 'sparse', 'fsubset',
+                'lowrank', 'bank', 'cache')
+
+    def _correlate_group(self, tmp, comp, f):
+        """
+        Correlate the (stacked) phases `tmp` according to the NWTC
+        'non-IEC' coherence of component `comp` (see
+        :meth:`cohereObj._correlate_group`).
+        """
+        if tslib is None:
+            return cohereObj._correlate_group(self, tmp, comp, f)
+        u = self.grid.flatten(self.prof.u).copy(order='F')
+        tslib.nonieccoh(tmp,
+                        f, self.grid.pair_dist, self.grid.pair_zmean,
+                        u, self.a[comp], self.b[comp],
+                        self.CohExp, self.ncore)
+
+    def _pair_fcut(self, comp):
+        """
+        The frequency above which the NWTC coherence of each pair of
+        points is less than `tol` (see :meth:`cohereObj._pair_fcut`).
+        """
+        r = self.pair_dist
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = -np.log(self.tol) / (self.a[comp] *
+                                         (r / self.pair_zmean) ** self.CohExp)
+            out = self.pair_umean / r * \
+                np.sqrt(np.maximum(ratio ** 2 - (self.b[comp] * r) ** 2, 0))
+        out[r == 0] = np.inf
+        return out
+
+    def _scale_inputs(self, comp):
+        # The coherence depends on f/um, and um/uhub depends only on
+        # the shape of the profile (rounded so that profiles of the
+        # same shape have the same key).
+        uhub = float(self.prof.uhub)
+        shape = (self.grid.flatten(self.prof.u) / uhub).round(6)
+        return uhub, (shape, self.a[comp], self.b[comp], self.CohExp)
+
+    def _cache_inputs(self, comp):
+        return (self.grid.flatten(self.prof.u),
+                self.a[comp], self.b[comp], self.CohExp)
+
+    def calc_factors(self, comp, fslice=slice(None)):
+        """
+        Compute the packed Cholesky factors of the coherence matrix of
+        component `comp` (see :meth:`cohereObj.calc_factors`).
+        """
+        if tslib is None:
+            return cohereObj.calc_factors(self, comp, fslice)
+        u = self.grid.flatten(self.prof.u).copy(order='F')
+        return tslib.nonieccohfac(self.grid.f[fslice],
+                                  self.grid.pair_dist, self.grid.pair_zmean,
+                                  u,
+                                  self.a[comp], self.b[comp], self.CohExp,
+                                  self.ncore)
+
+    def calcCohMatrix(self, f, comp):
+        """
+        Compute the NWTC coherence matrix of component `comp` for the
+        frequencies `f` (see :meth:`cohereObj.calcCohMatrix`).
+        """
+        two = ts_float(2)
+        r = self.pair_dist
+        fr = (r / self.pair_umean)[None, :, :] * \
+            np.array(f, dtype=ts_float, ndmin=1)[:, None, None]
+        coef = -self.a[comp] * (r / self.pair_zmean) ** self.CohExp
+        return np.exp(coef * np.sqrt(fr ** two +
+                                     (self.b[comp] * r) ** two))
+
+    @property
+    def y_homogeneous(self,):
+        """
+        Whether the coherence is homogeneous in y (i.e. the mean
+        velocity varies only with height).
         """
-        Compute the `correlated phases` for each grid-point from the
-        input `phases` based on the coherence NWTC 'non-IEC coherence
-        model.
+        u = self.prof.u
+        return bool((u == u[:, :1]).all())
 
-        Parameters
-        ----------
-        phases : array_like(np, nf)
-                 The input (generally randomized) phases for each
-                 point for each frequency.
+    def calcCohBlocks(self, f, comp):
+        """
+        Compute the NWTC coherence of component `comp` between the
+        points of the first column of the grid and those of each
+        column, for the frequencies `f`. This requires a
+        y-homogeneous profile (see :attr:`y_homogeneous`), and is used
+        by the :class:`toeplitzBackend
+        <pyts.cohereModels.toeplitz.toeplitzBackend>`.
 
         Returns
         -------
-        phases : array_like(np, nf)
-                 The correlated phases according to this cohereObj's
-                 coherence model (see :meth:`calcCoh`).
-
-        Notes
-        -----
-
-        This method should not be called explicitly.  It is called by
-        a cohereObj instance's __call__ method.
-
-        See also
-        --------
-        calcCoh : computes the coherence for individual grid-point pairs.
-
+        coh : array_like(nf, n_y, n_z, n_z)
+              The coherence between the points (iz0, 0) and (iz1, k)
+              is coh[:, k, iz0, iz1].
         """
-        if tslib is not None:
-            tmp = np.zeros((self.n_p, self.n_f), dtype=ts_complex, order='F')
-            u = self.grid.flatten(self.prof.u).copy(order='F')
-            for icomp in range(3):
-                tmp[:] = phases[icomp]
-                tslib.nonieccoh(tmp, self.grid.f,
-                                self.grid.y, self.grid.z, u,
-                                self.a[icomp], self.b[icomp], self.CohExp,
-                                self.ncore, self.n_f, self.n_y, self.n_z)
-                phases[icomp] = tmp
-        else:
-            phases = cohereObj.calc_phases(self, phases)
-        return phases
+        two = ts_float(2)
+        z = self.grid.z
+        u = self.prof.u[:, 0]
+        dy = self.grid.y - self.grid.y[0]
+        r = np.sqrt(dy[:, None, None] ** two +
+                    (z[:, None] - z[None, :])[None] ** two)
+        zm = (z[:, None] + z[None, :]) / two
+        um = (u[:, None] + u[None, :]) / two
+        fr = (r / um)[None] * \
+            np.array(f, dtype=ts_float, ndmin=1)[:, None, None, None]
+        coef = -self.a[comp] * (r / zm) ** self.CohExp
+        return np.exp(coef * np.sqrt(fr ** two + (self.b[comp] * r) ** two))
 
     def calcCoh(self, f, comp, ii, jj):
         """
@@ -205,6 +270,67 @@ class nwtc(cohereModelBase):
 
 class cohereObjIEC(cohereObj):
 
+    uses_tslib = tslib is not None
+    backends = ('tslib', 'numpy', 'circulant', 'sparse', 'fsubset',
+                'lowrank', 'bank', 'cache')
+    # Only the u-component is correlated by the IEC model.
+    _coh_comps = (0, )
+
+    def _scale_inputs(self, comp):
+        return float(self.prof.uhub), (self.a, self.Lc)
+
+    def _cache_inputs(self, comp):
+        return (self.prof.uhub, self.a, self.Lc)
+
+    def calc_factors(self, comp, fslice=slice(None)):
+        """
+        Compute the packed Cholesky factors of the coherence matrix of
+        component `comp` (see :meth:`cohereObj.calc_factors`).
+        """
+        if tslib is None:
+            return cohereObj.calc_factors(self, comp, fslice)
+        return tslib.ieccohfac(self.grid.f[fslice],
+                               self.grid.pair_dist, self.prof.uhub,
+                               self.a, self.Lc,
+                               self.ncore, self.n_p)
+
+    def calcCohMatrix(self, f, comp):
+        """
+        Compute the IEC coherence matrix of component `comp` for the
+        frequencies `f` (see :meth:`cohereObj.calcCohMatrix`).
+
+        The v- and w-component coherence matrices are identity
+        matrices.
+        """
+        if comp != 0:
+            out = np.zeros((len(f), self.n_p, self.n_p), dtype=ts_float)
+            out[:, np.arange(self.n_p), np.arange(self.n_p)] = 1
+            return out
+        r = self.pair_dist
+        fr = (r / self.prof.uhub)[None, :, :] * \
+            np.array(f, dtype=ts_float, ndmin=1)[:, None, None]
+        return np.exp(-self.a * np.sqrt(fr ** 2 +
+                                        (0.12 * r / self.Lc) ** 2))
+
+    def calcCohDist(self, f, comp, r):
+        """
+        Compute the IEC coherence of component `comp` for the
+        frequencies `f` and the separation distances `r` (this is used
+        by the :class:`circulantBackend
+        <pyts.cohereModels.circulant.circulantBackend>`).
+
+        Returns
+        -------
+        coh : array_like(nf, \*r.shape)
+        """
+        f = np.array(f, ndmin=1)
+        r = np.array(r)
+        f = f.reshape(f.shape + (1, ) * r.ndim)
+        if comp != 0:
+            return (r == 0) + 0 * f
+        return np.exp(-self.a * np.sqrt((f * r / self.prof.uhub) ** 2 +
+                                        (0.12 * r / self.Lc) ** 2))
+
     def calcCoh(self, f, comp, ii, jj):
         """
         Calculate the coherence for a velocity component, between two points.
@@ -240,25 +366,30 @@ class cohereObjIEC(cohereObj):
         else:
             return 0
 
-    def calc_phases(self, phases):
+    def _correlate_group(self, tmp, comp, f):
         """
-        Compute and set the full cross-coherence matrix for component
-        *comp* for 'coherence calculator' instance *cohi*.
-
-        Compute the coherence array for coherence instance cohi for
-        the IEC model.
-
+        Correlate the (stacked) phases `tmp` according to the IEC
+        coherence (see :meth:`cohereObj._correlate_group`).
         """
-        if tslib is not None:
-            out = phases[0].copy(order='F')
-            tslib.ieccoh(out, self.grid.f,
-                         self.y, self.z, self.prof.uhub,
-                         self.a, self.Lc,
-                         self.ncore, self.n_f, self.n_y, self.n_z)
-            phases[0] = out
-            return phases
-        else:
-            return cohereObj.calc_phases(self, phases)
+        if tslib is None:
+            return cohereObj._correlate_group(self, tmp, comp, f)
+        tslib.ieccoh(tmp, f,
+                     self.grid.pair_dist, self.prof.uhub,
+                     self.a, self.Lc,
+                     self.ncore)
+
+    def _pair_fcut(self, comp):
+        """
+        The frequency above which the IEC coherence of each pair of
+        points is less than `tol` (see :meth:`cohereObj._pair_fcut`).
+        """
+        r = self.pair_dist
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out = self.prof.uhub / r * \
+                np.sqrt(np.maximum((np.log(self.tol) / self.a) ** 2 -
+                                   (0.12 * r / self.Lc) ** 2, 0))
+        out[r == 0] = np.inf
+        return out
 
 
 class iec(cohereModelBase):
@@ -0,0 +1,139 @@
+"""
+This module defines a process-pool 'executor' for the Python (NumPy)
+coherence calculations.
+
+The frequencies of a block of phases are split into bands, and the
+phases of each band are correlated by a separate (forked) worker
+process. The phases are placed in shared memory (a
+multiprocessing.shared_memory block when it is available, python >=
+3.8, otherwise an anonymous shared memory-map), so the workers read
+and write them in place rather than pickling them.
+
+This requires the 'fork' start method (i.e. it is not available on
+Windows), because the workers inherit the coherence object from the
+parent process.
+
+"""
+from ..base import np
+import multiprocessing
+import mmap
+import sys
+try:
+    from multiprocessing import shared_memory  # python >= 3.8
+except ImportError:
+    shared_memory = None
+
+if hasattr(multiprocessing, 'get_context'):
+    try:
+        _mp = multiprocessing.get_context('fork')
+    except ValueError:
+        _mp = None
+elif sys.platform.startswith('win'):
+    _mp = None
+else:
+    _mp = multiprocessing
+
+available = _mp is not None
+
+# The state that is inherited by the (forked) worker processes.
+_state = {}
+
+
+class sharedArray(object):
+
+    """
+    A (Fortran-ordered) array in shared memory.
+
+    Parameters
+    ----------
+    shape : tuple
+            The shape of the array.
+    dtype : numpy dtype
+            The data type of the array.
+
+    """
+
+    def __init__(self, shape, dtype_):
+        nbytes = max(int(np.prod(shape)) * np.dtype(dtype_).itemsize, 1)
+        if shared_memory is not None:
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            buf = self._shm.buf
+        else:
+            self._shm = None
+            buf = mmap.mmap(-1, nbytes)
+        self.array = np.ndarray(shape, dtype=dtype_, buffer=buf, order='F')
+
+    def close(self,):
+        """
+        Release the shared memory. The array must not be used after
+        this is called.
+        """
+        del self.array
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+
+
+def _calc_band(args):
+    """
+    Correlate the phases of one band of frequencies (this runs in a
+    worker process).
+    """
+    j0, j1, fslice = args
+    cohi = _state['cohere']
+    band = _state['array'][..., j0:j1]
+    # Only return the information added by this band.
+    cohi.info = {}
+    out = cohi._calc_phases_serial(band, fslice)
+    if out is not band:
+        band[:] = out
+    return cohi.info
+
+
+def calc_phases(cohi, phases, fslice, n_workers):
+    """
+    Correlate `phases` using the coherence object `cohi`
+    (:meth:`cohereObj._calc_phases_serial`) in `n_workers` worker
+    processes.
+
+    Parameters
+    ----------
+    cohi : :class:`cohereObj`
+           The coherence object.
+    phases : array_like(3, np, [nrhs,] nf)
+             The phases (these are modified in place).
+    fslice : slice
+             The block of frequencies (a slice into `grid.f`) that
+             `phases` corresponds to.
+    n_workers : int
+                The number of worker processes.
+
+    Returns
+    -------
+    phases : array_like(3, np, [nrhs,] nf)
+             The correlated phases.
+    """
+    i0 = fslice.indices(len(cohi.grid.f))[0]
+    n_f = phases.shape[-1]
+    n_band = max(min(n_workers, n_f), 1)
+    edges = [(n_f * idx) // n_band for idx in range(n_band + 1)]
+    bands = [(j0, j1, slice(i0 + j0, i0 + j1))
+             for j0, j1 in zip(edges[:-1], edges[1:]) if j1 > j0]
+    shared = sharedArray(phases.shape, phases.dtype)
+    try:
+        shared.array[:] = phases
+        _state.update(cohere=cohi, array=shared.array)
+        pool = _mp.Pool(len(bands))
+        try:
+            infos = pool.map(_calc_band, bands)
+        finally:
+            pool.close()
+            pool.join()
+        phases[:] = shared.array
+        # Collect the information that the workers added.
+        for inf in infos:
+            cohi._add_info(**inf)
+    finally:
+        _state.clear()
+        shared.close()
+    return phases
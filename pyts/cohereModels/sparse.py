@@ -0,0 +1,155 @@
+"""
+This module defines a sparse (distance-truncated) coherence backend
+for large grids.
+
+For wide grids, the coherence of most pairs of points that are far
+apart is negligible at all but the lowest frequencies. At each
+frequency this backend drops the pairs whose coherence is below a
+threshold, reorders the points to reduce the bandwidth (and therefore
+the fill-in) of the resulting sparse matrix (reverse Cuthill-McKee),
+and factors it with a banded Cholesky decomposition. This costs
+O(n_p b^2) rather than O(n_p^3) operations, where b is the bandwidth.
+
+Without reordering the points are in the row-major grid order of
+:meth:`gridObj.flatten <pyts.base.gridObj.flatten>`, so the matrix is
+block-banded (with a bandwidth of a few rows of the grid).
+
+This backend requires scipy.
+
+"""
+from ..base import np, ts_float
+from numpy.linalg import cholesky, LinAlgError
+try:
+    from scipy.linalg import cholesky_banded
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import reverse_cuthill_mckee
+except ImportError:
+    cholesky_banded = None
+
+
+class sparseBackend(object):
+
+    """
+    A sparse, distance-truncated coherence backend.
+
+    Parameters
+    ----------
+    threshold : float, optional (1e-3)
+                Coherence values below this are dropped (set to zero).
+    reorder : bool, optional (True)
+              Reorder the points (reverse Cuthill-McKee) at frequencies
+              where this reduces the bandwidth of the matrix.
+              Otherwise the row-major grid order is used.
+
+    Notes
+    -----
+    The truncated coherence matrix is not guaranteed to be positive
+    definite. If its factorization fails at a frequency, the full
+    coherence matrix is factored instead (these are counted by
+    'n_dense_fallback' in the info).
+
+    Reordering the points changes the Cholesky factor, so the
+    velocity time-series differ from those of the row-major order (or
+    the default dense backend) for the same random seed, although
+    their statistics (the coherence) are the same.
+
+    The backend adds the following to the coherence object's `info`:
+
+    - fill_ratio: the number of elements of the banded factors
+      divided by the number of non-zero elements of the (lower
+      triangle of the) truncated coherence matrices.
+    - coh_error: the largest error in the coherence reproduced by the
+      factors (i.e. the largest dropped coherence value).
+    - bandwidth: the largest bandwidth of the factors.
+
+    Examples
+    --------
+    Set the `backend` of a coherence model:
+
+    >>> cm = pyts.cohereModels.nwtc()
+    >>> cm.backend = pyts.cohereModels.sparseBackend(threshold=1e-3)
+
+    """
+    name = 'sparse'
+
+    def __init__(self, threshold=1e-3, reorder=True):
+        if cholesky_banded is None:
+            raise ImportError("The 'sparse' coherence backend requires scipy.")
+        self.threshold = threshold
+        self.reorder = reorder
+
+    def __repr__(self,):
+        return ('<PyTurbSim sparse coherence backend '
+                '(threshold={}, reorder={})>'.format(self.threshold,
+                                                     self.reorder))
+
+    def __call__(self, cohi, tmp, comp, f):
+        """
+        Correlate the (stacked) phases `tmp` (np x n_rhs x nf, in
+        place) according to the coherence of component `comp` of the
+        coherence object `cohi` at the frequencies `f`.
+        """
+        stats = dict(n_band=0, n_kept=0, coh_error=0., bandwidth=0,
+                     n_dense_fallback=0)
+        for fs in cohi._iter_fstack(len(f)):
+            coh = cohi.calcCohMatrix(f[fs], comp)
+            for idx in range(coh.shape[0]):
+                self._correlate(coh[idx], tmp[..., fs.start + idx], stats)
+        cohi._add_info(backend=self.name, **stats)
+
+    @staticmethod
+    def _bandwidth(keep):
+        """
+        The (lower) bandwidth of the non-zero pattern `keep`.
+        """
+        ii, jj = np.nonzero(keep)
+        return int((ii - jj).max())
+
+    def _correlate(self, coh, ph, stats):
+        """
+        Correlate the phases `ph` (np x n_rhs, in place) at one
+        frequency, with the coherence matrix `coh` (np x np).
+        """
+        n_p = coh.shape[0]
+        keep = coh >= self.threshold
+        dropped = coh[~keep]
+        keep[np.arange(n_p), np.arange(n_p)] = True
+        n_kept = (keep.sum() + n_p) // 2
+        stats['n_kept'] += n_kept
+        if n_kept == n_p:
+            # The truncated matrix is diagonal (identity).
+            stats['n_band'] += n_p
+            if dropped.size:
+                stats['coh_error'] = max(stats['coh_error'],
+                                         float(dropped.max()))
+            return
+        perm = np.arange(n_p)
+        bw = self._bandwidth(keep)
+        if self.reorder:
+            rcm = reverse_cuthill_mckee(csr_matrix(keep),
+                                        symmetric_mode=True)
+            bw_rcm = self._bandwidth(keep[rcm][:, rcm])
+            if bw_rcm < bw:
+                perm, bw = rcm, bw_rcm
+        cp = np.where(keep, coh, 0)[perm][:, perm].astype(np.float64)
+        # The lower band storage of LAPACK: ab[k, j] = cp[j + k, j]
+        ab = np.zeros((bw + 1, n_p))
+        for k in range(bw + 1):
+            ab[k, :n_p - k] = np.diagonal(cp, -k)
+        try:
+            lb = cholesky_banded(ab, lower=True).astype(ts_float)
+        except LinAlgError:
+            stats['n_dense_fallback'] += 1
+            stats['n_band'] += n_p * (n_p + 1) // 2
+            fac = cholesky(coh).astype(ts_float)
+            ph[:] = np.dot(fac, ph)
+            return
+        stats['n_band'] += (bw + 1) * n_p - bw * (bw + 1) // 2
+        if dropped.size:
+            stats['coh_error'] = max(stats['coh_error'], float(dropped.max()))
+        stats['bandwidth'] = max(stats['bandwidth'], bw)
+        x = ph[perm]
+        out = lb[0][:, None] * x
+        for k in range(1, bw + 1):
+            out[k:] += lb[k, :n_p - k][:, None] * x[:n_p - k]
+        ph[perm] = out
@@ -0,0 +1,134 @@
+"""
+This module defines a block-Toeplitz coherence backend for coherence
+models whose coherence is homogeneous in y (e.g. the NWTC model with
+a mean-velocity profile that varies only with height).
+
+If the points are ordered by column (y) rather than by row (z), the
+coherence matrix of such a model is block-Toeplitz: it is made of
+n_y x n_y blocks (n_z x n_z) that depend only on the y-separation of
+the columns. The backend factors it with the multichannel (block)
+Levinson recursion (Whittle, 1963), which computes the (block)
+prediction coefficients of each column from the previous columns in
+O(n_z^3 n_y^2) operations, rather than O(n_z^3 n_y^3) for the dense
+Cholesky factorization. The correlated phases of each column are
+synthesized from its prediction coefficients and the phases of the
+previous columns (the 'innovations' form of the factorization), so the
+full factor is never stored.
+
+"""
+from .base import is_uniform
+from ..base import np, ts_complex
+from numpy import linalg
+
+
+class toeplitzBackend(object):
+
+    """
+    A block-Toeplitz (block Levinson) coherence backend.
+
+    The coherence object must define a `calcCohBlocks` method, which
+    returns the coherence between the first column of the grid and
+    each column, and a `y_homogeneous` attribute that indicates
+    whether the coherence is homogeneous in y (see
+    :meth:`cohereObjNWTC.calcCohBlocks
+    <pyts.cohereModels.main.cohereObjNWTC.calcCohBlocks>`).
+
+    Notes
+    -----
+    The points are ordered by column for the factorization, so the
+    velocity time-series differ from those of the default (Cholesky)
+    backend for the same random seed, although their statistics (the
+    coherence) are the same. This backend is therefore never selected
+    automatically (see :func:`backends.select
+    <pyts.cohereModels.backends.select>`); set it as the `backend` of
+    the coherence model to use it.
+
+    The grid must be uniformly spaced in y.
+
+    Examples
+    --------
+    >>> cm = pyts.cohereModels.nwtc()
+    >>> cm.backend = pyts.cohereModels.toeplitzBackend()
+
+    """
+    name = 'toeplitz'
+    # The maximum number of coherence values (n_f x n_y x n_z x n_z)
+    # that are computed at a time.
+    stack_size = 2 ** 22
+
+    def __repr__(self,):
+        return '<PyTurbSim block-Toeplitz coherence backend>'
+
+    @staticmethod
+    def available(cohi):
+        return (getattr(cohi, 'y_homogeneous', False) and
+                is_uniform(cohi.grid.y))
+
+    def __call__(self, cohi, tmp, comp, f):
+        """
+        Correlate the (stacked) phases `tmp` (np x n_rhs x nf, in
+        place) according to the coherence of component `comp` of the
+        coherence object `cohi` at the frequencies `f`.
+        """
+        if not self.available(cohi):
+            raise Exception("The block-Toeplitz backend requires a "
+                            "coherence that is homogeneous in y (e.g. the "
+                            "'nwtc' model with a y-homogeneous profile) on "
+                            "a grid that is uniformly spaced in y.")
+        grid = cohi.grid
+        n_z, n_y = grid.n_z, grid.n_y
+        n_rhs = tmp.shape[1]
+        n_stack = max(self.stack_size // (n_y * n_z * n_z), 1)
+        for i0 in range(0, len(f), n_stack):
+            i1 = min(i0 + n_stack, len(f))
+            shp = (n_y, n_z, n_rhs, i1 - i0)
+            # tmp[iz*n_y + iy] -> ph[:, iy, iz] (nf x n_y x n_z x n_rhs)
+            ph = tmp[..., i0:i1].reshape(shp, order='F').transpose(3, 0, 1, 2)
+            blocks = cohi.calcCohBlocks(f[i0:i1], comp).astype(np.float64)
+            ph = self._levinson(blocks, ph)
+            tmp[..., i0:i1] = ph.transpose(1, 2, 3, 0).reshape(
+                tmp[..., i0:i1].shape, order='F')
+        cohi._add_info(backend=self.name, n_freq_toeplitz=len(f))
+
+    @staticmethod
+    def _levinson(R, x):
+        """
+        Synthesize the correlated phases of each column with the
+        multichannel Levinson recursion.
+
+        Parameters
+        ----------
+        R : array_like(nf, n_y, n_z, n_z)
+            The coherence between the points of a column and those of
+            the column `k` columns away (R[:, k]).
+        x : array_like(nf, n_y, n_z, n_rhs)
+            The input phases.
+
+        Returns
+        -------
+        y : array_like(nf, n_y, n_z, n_rhs)
+            The correlated phases.
+        """
+        n_y = R.shape[1]
+        y = np.empty(x.shape, dtype=np.complex128)
+        Pf = R[:, 0].copy()
+        Pb = R[:, 0].copy()
+        y[:, 0] = np.matmul(linalg.cholesky(Pf), x[:, 0])
+        # The forward (A) and backward (B) prediction coefficients.
+        A = B = R[:, :0]
+        for m in range(n_y - 1):
+            delta = R[:, m + 1] + np.matmul(A, R[:, m:0:-1]).sum(1)
+            Kf = -linalg.solve(Pb, delta.transpose(0, 2, 1)).transpose(0, 2, 1)
+            Kb = -linalg.solve(Pf, delta).transpose(0, 2, 1)
+            A, B = (np.concatenate((A + np.matmul(Kf[:, None], B[:, ::-1]),
+                                    Kf[:, None]), 1),
+                    np.concatenate((B + np.matmul(Kb[:, None], A[:, ::-1]),
+                                    Kb[:, None]), 1))
+            Pf = Pf + np.matmul(Kf, delta.transpose(0, 2, 1))
+            Pb = Pb + np.matmul(Kb, delta)
+            # Symmetrize, to limit the growth of round-off errors.
+            Pf = (Pf + Pf.transpose(0, 2, 1)) / 2
+            Pb = (Pb + Pb.transpose(0, 2, 1)) / 2
+            y[:, m + 1] = (np.matmul(linalg.cholesky(Pf), x[:, m + 1]) -
+                           np.matmul(A, y[:, m::-1]).sum(1))
+        return y.astype(ts_complex)
@@ -0,0 +1,91 @@
+"""
+This module defines the inverse-FFT 'stage' of PyTurbSim, which
+transforms the scaled, correlated phases (the spectral array) into
+velocity time-series.
+
+The stage keeps the data in single precision (ts_complex -> ts_float)
+and writes the time-series into a preallocated output array. When
+scipy.fft (scipy >= 1.4) is available it is used with `workers`
+threads, otherwise the transform is computed with numpy.fft one piece
+of the array at a time (so that the double-precision temporary arrays
+numpy creates remain small).
+
+"""
+from .base import np, ts_float
+from numpy import fft as np_fft
+from multiprocessing.pool import ThreadPool
+try:
+    # scipy >= 1.4 (in older versions scipy.fft is a function).
+    from scipy.fft import irfft as sp_irfft
+except ImportError:
+    sp_irfft = None
+
+
+class irfftStage(object):
+
+    """
+    The inverse (real) FFT stage of a PyTurbSim run.
+
+    Parameters
+    ----------
+    workers : int, optional (None)
+              The number of threads to use for the transform. The
+              default is the number of cores of the run
+              (`tsrun.ncore`).
+    use_scipy : bool, optional (True)
+                Use scipy.fft if it is available.
+
+    """
+
+    def __init__(self, workers=None, use_scipy=True):
+        self.workers = workers
+        self.use_scipy = use_scipy
+
+    def __call__(self, tsrun, spec, out=None):
+        """
+        Compute the inverse FFT of `spec` for the `tsrun` instance.
+
+        Parameters
+        ----------
+        tsrun : :class:`tsrun <pyts.main.tsrun>`
+                A TurbSim run object.
+        spec : array_like(..., n_f+1, dtype=ts_complex)
+               The spectral array. This array may be overwritten.
+        out : array_like(..., n_t, dtype=ts_float), optional
+              The output array (default: a new array).
+
+        Returns
+        -------
+        out : array_like(..., n_t, dtype=ts_float)
+              The time-series.
+
+        """
+        n_t = 2 * (spec.shape[-1] - 1)
+        if out is None:
+            out = np.empty(spec.shape[:-1] + (n_t, ), dtype=ts_float)
+        workers = self.workers
+        if workers is None:
+            workers = tsrun.ncore
+        workers = max(int(workers), 1)
+        if sp_irfft is not None and self.use_scipy:
+            for idx in range(spec.shape[0]):
+                out[idx] = sp_irfft(spec[idx], n_t, workers=workers,
+                                    overwrite_x=True)
+            return out
+        # The numpy transform is computed in double precision, so it
+        # is done for one row (the last two dimensions) at a time.
+        rows = list(np.ndindex(*spec.shape[:-2]))
+
+        def _irfft(idx):
+            out[idx] = np_fft.irfft(spec[idx], n_t)
+        # Threads only help here if numpy.fft releases the GIL.
+        if workers > 1 and len(rows) > 1:
+            pool = ThreadPool(min(workers, len(rows)))
+            try:
+                pool.map(_irfft, rows)
+            finally:
+                pool.close()
+        else:
+            for idx in rows:
+                _irfft(idx)
+        return out
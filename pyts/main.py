@@ -8,7 +8,7 @@ typical user will want access to. For a more compact version of the
 PyTurbSim interface import the ./api.py package.
 
 """
-from .base import ts_complex, gridProps, dbg, np, statObj
+from .base import ts_complex, ts_float, gridProps, dbg, np, statObj
 from .profModels.base import profModelBase, profObj
 from .specModels.base import specModelBase, specObj
 from .cohereModels.base import cohereModelBase, cohereObj, cohereUser
@@ -18,7 +18,7 @@ import _version as ver
 from .io import write
 from numpy import random
 from numpy import ulonglong
-from numpy.fft import irfft
+from .ifft import irfftStage
 import time
 
 # !!!VERSION_INCONSISTENCY
@@ -70,9 +70,47 @@ class tsrun(object):
                Initialize the run-object with a RandSeed.
     ncore : int,optional (1)
             Number of cores (processors) to use for the pyTurbSim run
+    block_size : int,optional (None)
+                 The number of frequencies to process at a time (see
+                 Notes).
+    max_memory : float,optional (None)
+                 The approximate peak memory (in bytes) to use for the
+                 run. This is used to compute `block_size` when that
+                 is not specified explicitly.
+    cohere_backend : str or backend instance,optional (None)
+                     The coherence backend (e.g. 'tslib', 'numpy' or
+                     'sparse', see the :mod:`pyts.cohereModels.backends`
+                     module). This overrides the `backend` of the
+                     coherence model. By default a backend is
+                     selected automatically.
+    phase_store : :class:`phaseStore <pyts.store.phaseStore>`,optional (None)
+                  A store of the correlated phases. If the stored
+                  phases were computed with the same inputs as this
+                  run (e.g. by a previous run that used a different
+                  spectral model) they are reused. Otherwise the
+                  phases are computed and stored.
+
+    Notes
+    -----
+
+    By default the random phases, Reynold's stress and coherence
+    correlation are computed for all frequencies at once. If
+    `block_size` or `max_memory` is specified, these steps are
+    performed one block of frequencies at a time and the scaled
+    phases of each block are written into a single (preallocated)
+    spectral buffer. This limits the peak memory of large runs to
+    roughly the size of the spectral buffer and the output array.
+
+    Note that the random phases are drawn block-by-block, so runs
+    with different block sizes produce different (but statistically
+    equivalent) time-series for the same `RandSeed`. Use the
+    :class:`philoxPhase <pyts.phaseModels.main.philoxPhase>` phase
+    model to obtain phases that do not depend on the block size.
 
     """
-    def __init__(self, RandSeed=None, ncore=1):
+    def __init__(self, RandSeed=None, ncore=1,
+                 block_size=None, max_memory=None, cohere_backend=None,
+                 phase_store=None):
         """
         PyTurbSim 'run' objects can be initialized with a specific
         random seed, `RandSeed`, and number of cores, `ncore`.
@@ -82,18 +120,31 @@ class tsrun(object):
             self.RandSeed = random.randint(-2147483647, 2147483647)
         else:
             self.RandSeed = RandSeed
-        # Seeds for numpy must be positive, but original-TurbSim had
-        # negative seeds.  In order to attempt to be consistent, we
-        # use the values in the files but make them positive for the
-        # numpy random generator.
-        self.randgen = random.RandomState(
-            ulonglong(self.RandSeed + 2147483648))
+        self.randgen = self._seed2randgen(self.RandSeed)
         self.ncore = ncore
+        self.block_size = block_size
+        self.max_memory = max_memory
+        self.cohere_backend = cohere_backend
+        self.phase_store = phase_store
         if dbg:
             self.timer = dbg.timer('Veers84')
     # For now this is a place-holder, I may want to make this an
     # 'input property' eventually.
     phase = randPhase()
+    # The inverse fft 'stage' (see the pyts.ifft module).
+    fft = irfftStage()
+
+    @staticmethod
+    def _seed2randgen(seed):
+        """
+        Return a numpy random number generator for the (TurbSim)
+        random seed `seed`.
+        """
+        # Seeds for numpy must be positive, but original-TurbSim had
+        # negative seeds.  In order to attempt to be consistent, we
+        # use the values in the files but make them positive for the
+        # numpy random generator.
+        return random.RandomState(ulonglong(seed + 2147483648))
 
     @property
     def prof(self):
@@ -164,7 +215,7 @@ class tsrun(object):
 
     @prof.deleter
     def prof(self,):
-        if hasattr(self, 'profModel'):
+        if hasattr(self, 'profModel') and hasattr(self, '_prof'):
             del self._prof
 
     @property
@@ -207,7 +258,9 @@ class tsrun(object):
            The first dimension is for each component of the spectrum
            (u,v,w), the next two are for each point (z,y) in the
            grid, and the last dimension is the frequency dependence
-           of the spectrum.
+           of the spectrum. The z and y dimensions may have a length
+           of one if the spectrum is uniform in them (e.g. 3 x 1 x 1
+           x grid.n_f).
 
         See Also
         --------
@@ -226,8 +279,11 @@ class tsrun(object):
         if specModelBase in val.__class__.__mro__:
             self.specModel = val
         elif np.ndarray in val.__class__.__mro__:
+            # The array may have a length of one in the dimensions in
+            # which the spectra are uniform (see specObj).
             self._spec = specObj(self)
-            self._spec.array[:] = val
+            self._spec.array = np.array(val, dtype=ts_float, ndmin=4,
+                                        order='F')
         elif specObj in val.__class__.__mro__:
             self._spec = val
         else:
@@ -236,7 +292,7 @@ class tsrun(object):
 
     @spec.deleter
     def spec(self,):
-        if hasattr(self, 'specModel'):
+        if hasattr(self, 'specModel') and hasattr(self, '_spec'):
             del self._spec
 
     @property
@@ -319,16 +375,23 @@ class tsrun(object):
         if cohereModelBase in val.__class__.__mro__:
             self.cohereModel = val
         elif np.ndarray in val.__class__.__mro__:
-            self.cohereModel = cohereUser(val)
+            self._set_cohereObj(cohereUser(val))
         elif cohereObj in val.__class__.__mro__:
-            self.cohere = val
+            self._set_cohereObj(val)
         else:
             raise Exception('The input must be a coherence model, '
                             'coherence object or numpy array; it is none of these.')
 
+    def _set_cohereObj(self, val):
+        # The coherence object replaces the coherence model (and is
+        # kept by reset).
+        if hasattr(self, 'cohereModel'):
+            del self.cohereModel
+        self._cohere = val
+
     @cohere.deleter
     def cohere(self,):
-        if hasattr(self, 'cohereModel'):
+        if hasattr(self, 'cohereModel') and hasattr(self, '_cohere'):
             del self._cohere
 
     @property
@@ -400,7 +463,7 @@ class tsrun(object):
 
     @stress.deleter
     def stress(self,):
-        if hasattr(self, 'stressModel'):
+        if hasattr(self, 'stressModel') and hasattr(self, '_stress'):
             del self._stress
 
     def reset(self, seed=None):
@@ -438,6 +501,11 @@ class tsrun(object):
                                )
             else:
                 out[nm] = None
+        if (out['cohereModel'] is not None and
+                getattr(self, '_cohere', None) is not None and
+                self._cohere.info):
+            # e.g. the coherence cutoff frequency (see cohereModelBase.tol)
+            out['cohereModel']['info'] = dict(self._cohere.info)
         out['RandSeed'] = self.RandSeed
         out['RunTime'] = time.time() - time.mktime(self._starttime)
         return out
@@ -466,6 +534,48 @@ class tsrun(object):
 
     __call__ = run
 
+    def run_ensemble(self, seeds):
+        """
+        Run PyTurbSim once for each random seed in `seeds`.
+
+        The coherence factorization does not depend on the random
+        seed, so it is computed only once (for each frequency) and
+        applied to the phases of all seeds at once.
+
+        Parameters
+        ----------
+        seeds : iterable of ints
+                The random seeds (see `RandSeed`) of the runs.
+
+        Returns
+        -------
+        tsdata : generator of :class:`tsdata`
+                 The output of each run (in the order of `seeds`).
+
+        Notes
+        -----
+        The phases of all seeds are correlated before the first
+        :class:`tsdata` is returned, so the spectral buffers of all
+        seeds are held in memory at once (see the `block_size` and
+        `max_memory` parameters of :class:`tsrun`). The time-series
+        of each seed are identical to those of a :meth:`run` with
+        `RandSeed` set to that seed.
+
+        """
+        seeds = list(seeds)
+        self._starttime = time.localtime()
+        randgens = [self._seed2randgen(seed) for seed in seeds]
+        specs = self._calcEnsembleSpectra(seeds, randgens)
+        RandSeed = self.RandSeed
+        for seed, rgen in zip(seeds, randgens):
+            self.RandSeed = seed
+            try:
+                self.timeseries = self._spec2timeseries(specs.pop(0), rgen)
+                out = self._build_outdata()
+            finally:
+                self.RandSeed = RandSeed
+            yield out
+
     def _build_outdata(self,):
         """
         Construct the output data object and return it.
@@ -476,6 +586,41 @@ class tsrun(object):
         out.info = self.info
         return out
 
+    def _fblock_size(self, n_rhs=1):
+        """
+        The number of frequencies that are processed at a time.
+
+        This is `block_size` if it is specified, otherwise it is
+        estimated from `max_memory` (all frequencies are processed at
+        once if neither is specified). `n_rhs` is the number of sets
+        of phases (seeds) that are computed at once.
+        """
+        grid = self.grid
+        if self.block_size is not None:
+            return int(max(1, min(self.block_size, grid.n_f)))
+        if self.max_memory is None:
+            return grid.n_f
+        # The spectral buffer (complex64), the spectral amplitude and
+        # the output array (float32) do not depend on the block size.
+        n_fixed = grid.n_comp * grid.n_p * (8 * (grid.n_f + 1) * n_rhs +
+                                            4 * grid.n_f + 4 * grid.n_t)
+        # The random-phase, stress and coherence temporaries require
+        # roughly four complex64 values per point, component and
+        # frequency.
+        n_perf = grid.n_comp * grid.n_p * 4 * 8 * n_rhs
+        return int(max(1, min((self.max_memory - n_fixed) // n_perf,
+                              grid.n_f)))
+
+    def _iter_fblocks(self, n_rhs=1):
+        """
+        An iterator over the frequency-blocks (slices of `grid.f`)
+        of this run.
+        """
+        n_f = self.grid.n_f
+        nblock = self._fblock_size(n_rhs)
+        for i0 in range(0, n_f, nblock):
+            yield slice(i0, min(i0 + nblock, n_f))
+
     def _calcTimeSeries(self,):
         """
         Compute the u,v,w, timeseries based on the spectral, coherence
@@ -504,32 +649,166 @@ class tsrun(object):
         available it is used (it is much more efficient), otherwise
         the numpy implementation of Cholesky is used.
 
+        3) The phases are generated, correlated and scaled (by the
+        spectral amplitude) in place in a single spectral buffer, one
+        block of frequencies at a time (see the `block_size` and
+        `max_memory` parameters of :class:`tsrun`).
+
+        4) If the run has a `phase_store`, the correlated phases are
+        copied from it when they match this run's inputs (and are
+        stored in it otherwise), so that only the scaling and the
+        inverse fft are repeated.
+
         .. [1] Veers, Paul (1984) 'Modeling Stochastic Wind Loads on
                Vertical Axis Wind Turbines', Sandia Report 1909, 17
                pages.
 
         """
         grid = self.grid
-        tmp = np.zeros((grid.n_comp, grid.n_z, grid.n_y, grid.n_f + 1),
-                       dtype=ts_complex)
+        buf = self._spectral_buffer()
+        amp = self.spec.amplitude
+        self.cohere.info.clear()
+        store = self.phase_store
+        stored = key = None
+        if store is not None:
+            key = store.key(self)
+            stored = store.get(key)
+            if stored is None and key is not None:
+                store.begin(buf[..., 1:].shape)
+        if dbg:
+            self.timer.start()
+        for fslc in self._iter_fblocks():
+            phases = buf[..., fslc.start + 1:fslc.stop + 1]
+            if stored is not None:
+                phases[:] = stored[..., fslc]
+            else:
+                # First calculate the 'base' set of random phases:
+                self.phase(self, fslc, out=phases)
+                # Now correlate the phases at each point to set the Reynold's stress:
+                self._inplace(self.stress.calc_phases(phases), phases)
+                # Now correlate the phases between points to set the spatial coherence:
+                self._inplace(self.cohere.calc_phases(phases, fslc), phases)
+                if key is not None:
+                    store.write(fslc, phases)
+            # Now multiply the phases by the spectrum (in place, the
+            # reshape of the buffer is a view)...
+            ph = grid.reshape(phases)
+            ph *= amp[..., fslc]
+            del phases, ph
+        if stored is not None:
+            # The random-number generator state after the phases were
+            # computed (which selects the output time period).
+            self.randgen.set_state(store.randstate)
+            self.cohere._add_info(phases='stored')
+        elif key is not None:
+            store.commit(key, self.randgen.get_state())
+        if dbg:
+            self.timer.stop()
+        return self._spec2timeseries(grid.reshape(buf), self.randgen)
+
+    def _spectral_buffer(self,):
+        """
+        Allocate the spectral buffer (3 x n_p x n_f+1, including the
+        zero-frequency slot) in which the phases are generated,
+        correlated and scaled.
+
+        The buffer is Fortran-ordered (like the phases), so that each
+        block of frequencies is a contiguous piece of it.
+        """
+        grid = self.grid
+        return np.zeros((grid.n_comp, grid.n_p, grid.n_f + 1),
+                        dtype=ts_complex, order='F')
+
+    @staticmethod
+    def _inplace(out, phases):
+        """
+        Copy `out` into `phases` if a stress or coherence object
+        returned a new array (rather than modifying `phases` in
+        place).
+        """
+        if out is not phases:
+            phases[:] = out
+
+    def _calcEnsembleSpectra(self, seeds, randgens):
+        """
+        Compute the scaled, correlated phases (the input to the
+        inverse fft) for each of the random seeds `seeds` (and their
+        random number generators, `randgens`).
+
+        This is the same as the first part of :meth:`_calcTimeSeries`,
+        except that the phases of all `randgens` are correlated at
+        once by the coherence object (so that the coherence is
+        factored only once).
+
+        The phases of each seed are drawn (and correlated for the
+        Reynold's stress) in the frequency blocks of a single run, so
+        that they are identical to those of :meth:`run`. Only the
+        coherence is applied in smaller blocks (that hold the phases
+        of all seeds, see :meth:`_fblock_size`).
+
+        Returns
+        -------
+        specs : list of arrays (3 x nz x ny x nf+1)
+                The scaled phases for each random number generator.
+        """
+        grid = self.grid
+        n_rhs = len(randgens)
+        specs = [self._spectral_buffer() for rgen in randgens]
+        amp = self.spec.amplitude
+        self.cohere.info.clear()
+        randgen, RandSeed = self.randgen, self.RandSeed
+        n_sub = self._fblock_size(n_rhs)
         if dbg:
             self.timer.start()
-        # First calculate the 'base' set of random phases:
-        phases = self.phase(self)
-        # Now correlate the phases at each point to set the Reynold's stress:
-        phases = self.stress.calc_phases(phases)
-        # Now correlate the phases between points to set the spatial coherence:
-        phases = self.cohere.calc_phases(phases)
-        # Now multiply the phases by the spectrum...
-        tmp[..., 1:] = np.sqrt(self.spec.array) * grid.reshape(phases)
-        # and compute the inverse fft to produce the timeseries:
-        ts = irfft(tmp)
+        try:
+            for fslc in self._iter_fblocks():
+                for irhs, rgen in enumerate(randgens):
+                    # The phase model draws from self.randgen (or
+                    # uses self.RandSeed).
+                    self.randgen, self.RandSeed = rgen, seeds[irhs]
+                    ph = specs[irhs][..., fslc.start + 1:fslc.stop + 1]
+                    self.phase(self, fslc, out=ph)
+                    self._inplace(self.stress.calc_phases(ph, rgen), ph)
+                for i0 in range(fslc.start, fslc.stop, n_sub):
+                    sub = slice(i0, min(i0 + n_sub, fslc.stop))
+                    bslc = slice(sub.start + 1, sub.stop + 1)
+                    phases = np.empty((grid.n_comp, grid.n_p, n_rhs,
+                                       sub.stop - sub.start),
+                                      dtype=ts_complex, order='F')
+                    for irhs, buf in enumerate(specs):
+                        phases[:, :, irhs] = buf[..., bslc]
+                    self._inplace(self.cohere.calc_phases(phases, sub),
+                                  phases)
+                    for irhs, buf in enumerate(specs):
+                        np.multiply(amp[..., sub],
+                                    grid.reshape(phases[:, :, irhs]),
+                                    out=grid.reshape(buf[..., bslc]))
+                    del phases
+                del ph
+        finally:
+            self.randgen, self.RandSeed = randgen, RandSeed
         if dbg:
             self.timer.stop()
+        return [grid.reshape(buf) for buf in specs]
+
+    def _spec2timeseries(self, tmp, randgen):
+        """
+        Compute the inverse fft of the scaled phases `tmp` and select
+        the output time period (using `randgen`).
+
+        The output period is copied from the (full-length) inverse
+        fft, so that the latter is not kept in memory by the result.
+        """
+        grid = self.grid
+        # and compute the inverse fft to produce the timeseries (this
+        # may overwrite tmp):
+        ts = self.fft(self, tmp)
         # Select only the time period requested:
         # Grab a random number of where to cut the timeseries.
-        i0_out = self.randgen.randint(grid.n_t - grid.n_t_out + 1)
-        ts = ts[..., i0_out:i0_out + grid.n_t_out] / (grid.dt / grid.n_f) ** 0.5
+        i0_out = randgen.randint(grid.n_t - grid.n_t_out + 1)
+        if grid.n_t_out < grid.n_t:
+            ts = ts[..., i0_out:i0_out + grid.n_t_out].copy()
+        ts /= ts_float((grid.dt / grid.n_f) ** 0.5)
         ts -= ts.mean(-1)[..., None]  # Make sure the turbulence has zero mean.
         return ts
 
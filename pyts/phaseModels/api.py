@@ -5,6 +5,10 @@ Available phase models
 ----------------------
 randPhase
   A uniform-distribution random-phase model.
+philoxPhase
+  A uniform-distribution random-phase model that uses a
+  counter-based random number generator, so that any block of
+  frequencies can be computed independently.
 
 """
-from main import randPhase
+from main import randPhase, philoxPhase
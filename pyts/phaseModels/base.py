@@ -6,7 +6,7 @@ coherence models.
 The basic phase model simply returns a 'random' array.
 
 """
-from ..base import modelBase, np, ts_complex
+from ..base import modelBase, np, ts_complex, ts_float
 
 
 class phaseModelBase(modelBase):
@@ -1,7 +1,13 @@
 """
 The main random phase models.
 """
-from .base import phaseModelBase, np, ts_complex
+from .base import phaseModelBase, np, ts_complex, ts_float
+from numpy.random import RandomState
+try:
+    # numpy >= 1.17
+    from numpy.random import Philox, SeedSequence
+except ImportError:
+    Philox = None
 
 
 class randPhase(phaseModelBase):
@@ -13,8 +19,11 @@ class randPhase(phaseModelBase):
     Because it is so simple, it has no initialization parameters.
 
     """
+    # The phases are computed (in double precision) this many values
+    # at a time, to limit the size of the temporary arrays.
+    chunk_size = 2 ** 18
 
-    def __call__(self, tsrun):
+    def __call__(self, tsrun, fslice=slice(None), out=None):
         """
         Create and calculate the phases for the `tsrun` instance.
 
@@ -22,6 +31,13 @@ class randPhase(phaseModelBase):
         ----------
         tsrun :         :class:`tsrun <pyts.main.tsrun>`
                         A TurbSim run object.
+        fslice :        slice, optional
+                        The block of frequencies (a slice into
+                        `tsrun.grid.f`) for which to compute phases
+                        (default: all frequencies).
+        out :           array_like(3,n_p,n_f), optional
+                        The array in which to place the phases
+                        (default: a new array).
 
         Returns
         -------
@@ -29,10 +45,167 @@ class randPhase(phaseModelBase):
                         An array of random phases.
 
         """
-        phases = np.empty((tsrun.grid.n_comp, tsrun.grid.n_p, tsrun.grid.n_f),
-                          dtype=ts_complex, order='F')
-        phases[:] = np.exp(1j * 2 * np.pi *
-                           tsrun.randgen.rand(tsrun.grid.n_comp,
-                                              tsrun.grid.n_p,
-                                              tsrun.grid.n_f))
-        return phases
+        n_f = len(tsrun.grid.f[fslice])
+        n_p = tsrun.grid.n_p
+        if out is None:
+            out = np.empty((tsrun.grid.n_comp, n_p, n_f),
+                           dtype=ts_complex, order='F')
+        # The random numbers are drawn in the same (C) order as a
+        # single rand(n_comp, n_p, n_f) call.
+        n_chunk = max(self.chunk_size // max(n_f, 1), 1)
+        for icomp in range(tsrun.grid.n_comp):
+            for i0 in range(0, n_p, n_chunk):
+                i1 = min(i0 + n_chunk, n_p)
+                out[icomp, i0:i1] = np.exp(1j * 2 * np.pi *
+                                           tsrun.randgen.rand(i1 - i0, n_f))
+        return out
+
+
+class philoxPhase(phaseModelBase):
+
+    """
+    This phase-model randomizes the phases uniformly (like
+    :class:`randPhase`) using a counter-based random number generator
+    (Philox).
+
+    The random number for each (component, frequency, point) has a
+    fixed position in the random stream of the seed, so the phases of
+    any block of frequencies can be computed independently of all
+    other blocks. The phases of a run therefore do not depend on the
+    block size (or the order in which blocks are computed), and
+    different blocks may be computed in parallel.
+
+    Parameters
+    ----------
+    seed : int, optional
+           The random seed (default: the RandSeed of the tsrun).
+
+    Notes
+    -----
+    The Philox generator requires numpy >= 1.17. With older versions
+    of numpy the random numbers are instead drawn from a Mersenne
+    Twister (:class:`numpy.random.RandomState`) that is seeded by
+    (seed, component, group), for fixed groups of `key_block`
+    frequencies. These phases also do not depend on the block size,
+    but they differ from the Philox phases for the same seed.
+
+    The phases are computed in single precision (24-bit uniforms,
+    float32 cos/sin), so they differ from those of
+    :class:`randPhase` for the same seed.
+
+    The random numbers used by the stress model (if the Reynold's
+    stress is non-zero) are still drawn from the tsrun's random
+    number generator.
+
+    """
+    # The number of random values that are computed at a time.
+    chunk_size = 2 ** 20
+    # The number of frequencies that share a RandomState (numpy < 1.17).
+    key_block = 64
+
+    def __init__(self, seed=None):
+        self.seed = seed
+
+    def _seed(self, tsrun):
+        """
+        The (positive) random seed of this model (or `tsrun`).
+        """
+        seed = self.seed
+        if seed is None:
+            seed = tsrun.RandSeed
+        # The seeds must be positive (see tsrun._seed2randgen).
+        return int(seed) + 2147483648
+
+    def _key(self, tsrun):
+        """
+        The Philox key for the random seed of this model (or `tsrun`).
+        """
+        return SeedSequence(self._seed(tsrun)).generate_state(2, np.uint64)
+
+    @staticmethod
+    def _uniform(key, start, count):
+        """
+        Return the `count` uniform random numbers (float32, [0, 1))
+        that begin at position `start` of the random stream for `key`.
+        """
+        # Each increment of the Philox counter produces 4 values.
+        ctr, offset = divmod(start, 4)
+        raw = Philox(key=key, counter=ctr).random_raw(offset + count)[offset:]
+        # Use the 24 most significant bits (the float32 mantissa).
+        return (raw >> np.uint64(40)).astype(ts_float) * ts_float(2. ** -24)
+
+    def _uniform_rs(self, seed, icomp, ff0, nff, n_p):
+        """
+        Return the uniform random numbers (float32, [0, 1), nff x n_p)
+        of component `icomp` for the frequencies ff0 to ff0 + nff,
+        drawn from RandomStates that are seeded by (`seed`, `icomp`,
+        group).
+        """
+        out = np.empty((nff, n_p), dtype=ts_float)
+        kb = self.key_block
+        for igrp in range(ff0 // kb, (ff0 + nff - 1) // kb + 1):
+            # The frequencies of this group that are needed.
+            g0 = max(ff0 - igrp * kb, 0)
+            g1 = min(ff0 + nff - igrp * kb, kb)
+            # Each value is a single 32-bit draw, so the first rows of
+            # the group do not depend on the number of rows drawn.
+            raw = RandomState([seed, icomp, igrp]).randint(
+                0, 2 ** 24, size=(g1, n_p), dtype=np.uint32)
+            o0 = igrp * kb + g0 - ff0
+            out[o0:o0 + g1 - g0] = raw[g0:]
+        out *= ts_float(2. ** -24)
+        return out
+
+    def __call__(self, tsrun, fslice=slice(None), out=None):
+        """
+        Create and calculate the phases for the `tsrun` instance.
+
+        Parameters
+        ----------
+        tsrun :         :class:`tsrun <pyts.main.tsrun>`
+                        A TurbSim run object.
+        fslice :        slice, optional
+                        The block of frequencies (a slice into
+                        `tsrun.grid.f`) for which to compute phases
+                        (default: all frequencies).
+        out :           array_like(3,n_p,n_f), optional
+                        The array in which to place the phases
+                        (default: a new array).
+
+        Returns
+        -------
+        out :           array_like(3,n_p,n_f)
+                        An array of random phases.
+
+        """
+        grid = tsrun.grid
+        n_p = grid.n_p
+        i0, i1, step = fslice.indices(grid.n_f)
+        n_f = len(range(i0, i1, step))
+        if out is None:
+            out = np.empty((grid.n_comp, n_p, n_f),
+                           dtype=ts_complex, order='F')
+        if n_f == 0:
+            return out
+        if Philox is None:
+            seed = self._seed(tsrun)
+        else:
+            key = self._key(tsrun)
+        # The random stream is ordered by (component, frequency, point).
+        n_chunk = max(self.chunk_size // (n_p * step), 1)
+        for icomp in range(grid.n_comp):
+            for j0 in range(0, n_f, n_chunk):
+                j1 = min(j0 + n_chunk, n_f)
+                ff0 = i0 + j0 * step
+                nff = (j1 - j0 - 1) * step + 1
+                if Philox is None:
+                    theta = self._uniform_rs(seed, icomp, ff0, nff, n_p)
+                else:
+                    theta = self._uniform(key, (icomp * grid.n_f + ff0) * n_p,
+                                          nff * n_p).reshape((nff, n_p))
+                theta = theta[::step].T
+                theta *= ts_float(2 * np.pi)
+                ph = out[icomp, :, j0:j1]
+                ph.real = np.cos(theta)
+                ph.imag = np.sin(theta)
+        return out
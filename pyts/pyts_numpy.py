@@ -2,4 +2,4 @@
 This module imports the pieces of numpy that are used by PyTurbSim.
 """
 
-from numpy import ndarray, array, zeros, ones, empty, empty_like, ones_like, zeros_like, arange, std, mean, sqrt, log, arctan, exp, pi, sort, dot, concatenate, abs, cumsum, sign, minimum, mod, angle, tile, where
+from numpy import ndarray, array, zeros, ones, empty, empty_like, ones_like, zeros_like, arange, std, mean, sqrt, log, arctan, exp, pi, sort, dot, concatenate, abs, cumsum, sign, minimum, mod, angle, tile, where, triu_indices, asfortranarray, ascontiguousarray, load, save, matmul, iscomplexobj, ndindex, multiply, uint64, cos, sin, eye, unique, errstate, inf, maximum, diagonal, nonzero, float64, complex128, argsort, searchsorted, trace, linspace, broadcast_to, prod, dtype, savez, uint32
@@ -17,17 +17,98 @@ class specObj(gridProps, calcObj):
     ----------
     tsrun : `tsrun` type
         The PyTurbSim run object in which the spectra will be used.
+    uniform : str, optional ('')
+        The grid dimensions ('y', 'z' or 'yz') in which the spectra
+        are uniform. The spectra are stored with a length of one in
+        these dimensions (e.g. 3 x 1 x 1 x n_f for 'yz', or 3 x n_z x
+        1 x n_f for 'y'), and :attr:`array` is a (read-only) broadcast
+        view of them.
+
+    Notes
+    -----
+    The spectra in their stored (reduced) shape are available as
+    :attr:`compact`. Set :attr:`array` to a new array (of the reduced
+    or full shape) to change the shape in which the spectra are
+    stored.
 
     """
 
-    def __init__(self, tsrun):
+    def __init__(self, tsrun, uniform=''):
         self.grid = tsrun.grid
         self.array = np.zeros((tsrun.grid.n_comp,
-                               tsrun.grid.n_z,
-                               tsrun.grid.n_y,
+                               1 if 'z' in uniform else tsrun.grid.n_z,
+                               1 if 'y' in uniform else tsrun.grid.n_y,
                                tsrun.grid.n_f),
                               dtype=ts_float, order='F')
 
+    @property
+    def shape(self,):
+        """
+        The (full) shape of the spectral array (3 x n_z x n_y x n_f).
+        """
+        return (self.grid.n_comp, self.n_z, self.n_y, self.n_f)
+
+    @property
+    def compact(self,):
+        """
+        The spectral array in the shape in which it is stored (which
+        has a length of one in the dimensions in which the spectra are
+        uniform, see :class:`specObj`).
+        """
+        return self._array
+
+    @property
+    def array(self,):
+        """
+        The spectral array (3 x n_z x n_y x n_f).
+
+        This is a read-only (broadcast) view of :attr:`compact` if the
+        spectra are uniform in y or z.
+        """
+        if self._array.shape == self.shape:
+            return self._array
+        return np.broadcast_to(self._array, self.shape)
+
+    @array.setter
+    def array(self, val):
+        if val.ndim != 4 or any([n not in (1, nf) for n, nf in
+                                 zip(val.shape, self.shape)]):
+            raise ValueError('The array shape does not match this grid.')
+        self._array = val
+        del self.amplitude
+        del self.tke
+
+    @property
+    def amplitude(self,):
+        """
+        The spectral amplitude, sqrt(array), that scales the
+        correlated phases.
+
+        This has the shape of :attr:`compact` (i.e. it broadcasts
+        against the grid).
+
+        This is computed once, and cached. It is cleared when the
+        array is set, but not when the array is modified in-place
+        (delete this attribute to clear it in that case).
+        """
+        if not hasattr(self, '_amplitude'):
+            self._amplitude = np.sqrt(self._array)
+        return self._amplitude
+
+    @amplitude.deleter
+    def amplitude(self,):
+        if hasattr(self, '_amplitude'):
+            del self._amplitude
+
+    def __setitem__(self, ind, val):
+        # Set the stored (compact) array; `val` must be uniform in the
+        # same dimensions.
+        if ind in self._alias0:
+            ind = self._alias0.index(ind)
+        self._array[ind] = val
+        del self.amplitude
+        del self.tke
+
     @property
     def Suu(self,):
         """
@@ -53,8 +134,19 @@ class specObj(gridProps, calcObj):
     def tke(self,):
         """
         This is the component-wise turbulent kinetic energy.
+
+        This is computed once, and cached (see :attr:`amplitude`).
         """
-        return trapz(self.array, x=self.f, axis=-1)
+        if not hasattr(self, '_tke'):
+            self._tke = trapz(self._array, x=self.f, axis=-1)
+        if self._tke.shape == self.shape[:-1]:
+            return self._tke
+        return np.broadcast_to(self._tke, self.shape[:-1])
+
+    @tke.deleter
+    def tke(self,):
+        if hasattr(self, '_tke'):
+            del self._tke
 
     @property
     def flat(self,):
@@ -73,7 +165,13 @@ class specObj(gridProps, calcObj):
         This is used for input into the functions that calculate the
         coherence.
 
+        If the spectra are uniform in y and z this is a (read-only)
+        broadcast view of :attr:`compact`.
+
         """
+        if self._array.shape[1:3] == (1, 1):
+            return np.broadcast_to(self._array[:, 0],
+                                   (self.grid.n_comp, self.n_p, self.n_f))
         return self.grid.flatten(self.array)
 
 
@@ -76,8 +76,14 @@ class tidal(specModelBase):
                         An IEC spectral object for the grid in :class:`.tsrun`.
 
         """
-        out = specObj(tsrun)
-        dudz = np.abs(tsrun.prof.dudz[None, :, :, None])
+        dudz = np.abs(tsrun.prof.dudz)
+        if (dudz == dudz[:, :1]).all():
+            # The spectra vary only with height.
+            out = specObj(tsrun, uniform='y')
+            dudz = dudz[:, :1]
+        else:
+            out = specObj(tsrun)
+        dudz = dudz[None, :, :, None]
         out.sigma2 = self.Ustar ** 2 * np.array([4.5, 2.25, 0.9])[:, None] \
             * np.exp(-2 * tsrun.grid.z[None, :] / self.Zref)
         out[:] = (out.sigma2[:, :, None, None]
@@ -291,7 +291,8 @@ class IECKai(iecbase):
 
         """
         self._check_ewm(tsrun.grid)
-        out = specObj(tsrun)
+        # The IEC spectra are uniform over the grid.
+        out = specObj(tsrun, uniform='yz')
         sig2 = 4 * self.IEC_Sigma(tsrun.prof.uhub) ** 2
         fctr = np.array([1, 0.64, 0.25], dtype=ts_float)
         L_u = self.Lambda(tsrun.grid.zhub) / tsrun.prof.uhub * \
@@ -345,7 +346,8 @@ class IECVKm(iecbase):
 
         """
         self._check_ewm(tsrun.grid)
-        out = specObj(tsrun)
+        # The IEC spectra are uniform over the grid.
+        out = specObj(tsrun, uniform='yz')
         sig2 = 4 * self.IEC_Sigma(tsrun.prof.uhub) ** 2
         L_u = 3.5 * self.Lambda(tsrun.grid.zhub) / tsrun.prof.uhub
         dnm = 1 + 71 * (out.f * L_u) ** 2
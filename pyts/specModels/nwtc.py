@@ -29,31 +29,21 @@ class genNWTC(specModelBase):
                         An NWTC spectral object for the grid in `tsrun`.
 
         """
-        out = specObj(tsrun)
-        # !!!FIXTHIS: The following lines bind calculation to the
-        # !!!MODEL. This goes against the PyTurbSim philosophy of
-        # !!!keeping calculations separated from models.
-        self.f = out.f
-        self._work = np.zeros(out.n_f, dtype=ts_float)
-        self.zhub = tsrun.grid.zhub
-        # Fixing this will require something like changing:
-        #   out[comp][iz, iy] = model(z, u, comp)
-        # to:
-        #   self.model(out, u, icomp, iz, iy)
-        # Note here that u must be supplied explicitly because it is
-        # not known to 'out'.
-        # This would also require:
-        # 1) deleting the self._work variable
-        # 2) changing ``def L(self,)`` from a property to ``def
-        #    L(self, tsrun)`` and using tsrun.grid.zhub their.
-        # 3) changing all calls to ``self.L`` accordingly.
-        for iz in range(out.n_z):
-            for iy in range(out.n_y):
-                z = out.grid.z[iz]
-                u = tsrun.prof.u[iz, iy]
-                for comp in out.grid.comp:
-                    self._work[:] = 0.0
-                    out[comp][iz, iy] = self.model(z, u, comp)
+        # The spectrum of each component is computed for all points at
+        # once (n_z x n_y x n_f), by broadcasting the height (n_z x 1 x
+        # 1) and the mean velocity (n_z x n_y x 1) against the
+        # frequency.
+        z = tsrun.grid.z.astype(ts_float)[:, None, None]
+        u = tsrun.prof.u.astype(ts_float)
+        if (u == u[:, :1]).all():
+            # The spectra vary only with height.
+            out = specObj(tsrun, uniform='y')
+            u = u[:, :1]
+        else:
+            out = specObj(tsrun)
+        u = u[:, :, None]
+        for comp in out.grid.comp:
+            out[comp] = self.model(out.f, z, u, comp, tsrun.grid.zhub)
         return out
 
 
@@ -135,22 +125,29 @@ class NWTC_stable(genNWTC):
     def _phim(self):
         return 1. + 4.7 * self.zL
 
-    def model(self, z, u, comp):
+    def model(self, f, z, u, comp, zhub=None):
         """
-        Calculate the spectral model for height `z`, velocity `u`, and
-        velocity component `comp`.
+        Calculate the spectral model for the frequencies `f`, heights
+        `z`, velocities `u`, and velocity component `comp`.
+
+        `f`, `z` and `u` are broadcast against each other (e.g. `f`
+        (n_f), `z` (n_z x 1 x 1) and `u` (n_z x n_y x 1) for the
+        spectrum at all points of a grid). `zhub` is not used by this
+        model.
         """
-        coef = self.coefs[comp]
+        # The coefficients of each component may be a list of (2
+        # element) coefficients, the model is then the sum of the
+        # model for each one.
+        coefs = np.array(self.coefs[comp], ndmin=2)
         z_u = z / u
-        denom = (self.f / self._phim)
+        denom = (f / self._phim)
         numer = (self._phie / self._phim) ** self.pow2_3 / self._phim * self.Ustar2
-        if coef.ndim > 1:
-            self._work[:] = 0
-            for c in coef:
-                self._work += self.model(z, u, comp)
-            return self._work
-        return (coef[0] * self.s_coef[comp, 0] * numer * z_u /
-                (1. + self.s_coef[comp, 1] * (coef[1] * z_u * denom) ** self.pow5_3))
+        out = 0
+        for coef in coefs:
+            out = out + (coef[0] * self.s_coef[comp, 0] * numer * z_u /
+                         (1. + self.s_coef[comp, 1] *
+                          (coef[1] * z_u * denom) ** self.pow5_3))
+        return out
 
 
 class NWTC_unstable(genNWTC):
@@ -186,9 +183,11 @@ class NWTC_unstable(genNWTC):
         self.zL = zL
         self.ZI = ZI
         if p_coefs is None:
-            self.p_coefs = p_coefs_unstable
+            p_coefs = p_coefs_unstable
         if f_coefs is None:
-            self.f_coefs = f_coefs_unstable
+            f_coefs = f_coefs_unstable
+        self.p_coefs = p_coefs
+        self.f_coefs = f_coefs
 
     def _sumfile_string(self, tsrun, ):
         sumstring_format = """
@@ -205,35 +204,42 @@ class NWTC_unstable(genNWTC):
                   w                =  [{f[2][0]:0.4g}, {f[2][1]:0.4g}]
         """
         return sumstring_format.format(dat=self,
-                                       Lmo=self.L,
+                                       Lmo=self.L(tsrun),
                                        p=self.p_coefs,
                                        f=self.f_coefs,)
 
-    @property
-    def L(self, ):
-        if not hasattr(self, 'zhub'):
-            raise Exception("The Monin-Obhukov is unknown until this "
-                            "model has been '__call__'d.")
-        return self.zhub / self.zL
+    def L(self, tsrun):
+        """
+        The Monin-Obhukov length scale for the run `tsrun` [m].
+        """
+        return self._L(tsrun.grid.zhub)
 
-    def model(self, z, u, comp):
+    def _L(self, zhub):
+        return zhub / self.zL
+
+    def model(self, f, z, u, comp, zhub):
         r"""
         Computes the spectrum for this 'unstable' spectral model.
 
         Parameters
         ----------
-        z : array_like (nz)
+        f : array_like (nf)
+            Frequency [hz].
+        z : array_like (nz,1,1)
             Height above the surface [m].
-        u : array_like (nz,ny)
+        u : array_like (nz,ny,1)
             Mean velocity [m/s].
         comp : int {0,1,2}
                Index (u,v,w) of the spectrum to compute.
+        zhub : float
+               The hub-height (which defines the Monin-Obhukov
+               length, see :meth:`L`) [m].
 
         Returns
         -------
-        spec : :class:`.specObj`
-               The spectral object which contains the 'array'
-               (property) of spectra at each point in the grid.
+        spec : array_like (nz,ny,nf)
+               The spectrum (`f`, `z` and `u` are broadcast against
+               each other).
 
         Notes
         -----
@@ -278,27 +284,25 @@ class NWTC_unstable(genNWTC):
         f_coef = self.f_coefs[comp]
         pow5_3 = self.pow5_3
         z_ZI = z / self.ZI
-        num0 = self.Ustar2 * self.ZI / u * (self.ZI / -self.L()) ** self.pow2_3
-        fZI_u = self.f * self.ZI / u
+        num0 = self.Ustar2 * self.ZI / u * (self.ZI / -self._L(zhub)) ** self.pow2_3
+        fZI_u = f * self.ZI / u
         z_u = z / u
         num1 = self.Ustar2 * z_u * (1 - z_ZI) ** 2
-        fz_u = self.f * z_u
+        fz_u = f * z_u
         if comp == 0:
             tmp0 = 1 + 15 * z_ZI
-            self._work = (p_coef[0] * num0 / (1 + (fZI_u * f_coef[0]) ** pow5_3)
-                          + p_coef[1] * num1 / (tmp0 + f_coef[1] * fz_u) ** pow5_3)
+            return (p_coef[0] * num0 / (1 + (fZI_u * f_coef[0]) ** pow5_3)
+                    + p_coef[1] * num1 / (tmp0 + f_coef[1] * fz_u) ** pow5_3)
         elif comp == 1:
             tmp0 = 1 + 2.8 * z_ZI
-            self._work = (p_coef[0] * num0 / (1 + f_coef[0] * fZI_u) ** pow5_3
-                          + p_coef[1] * num1 / (tmp0 + f_coef[1] * fz_u) ** pow5_3)
+            return (p_coef[0] * num0 / (1 + f_coef[0] * fZI_u) ** pow5_3
+                    + p_coef[1] * num1 / (tmp0 + f_coef[1] * fz_u) ** pow5_3)
             ## # Handle extra (e.g. wake, for outf_turb) coefficients:
             ## if coef.shape[0]>2 and not np.isnan(coef[2,0]+coef[2,1]):
-            # self._work+=coef[2,0]*17*num1/(tmp0+coef[2,1]*9.5*fz_u)**pow5_3
-        else:
-            self._work = (p_coef[0] * num0 / (1 + f_coef[0] * fZI_u) ** pow5_3
-                          * np.sqrt((fz_u ** 2 + (0.3 * z_ZI) ** 2) / (fz_u ** 2 + 0.0225))
-                          + p_coef[1] * num1 / (1 + f_coef[1] * fz_u ** pow5_3))
-        return self._work
+            # out+=coef[2,0]*17*num1/(tmp0+coef[2,1]*9.5*fz_u)**pow5_3
+        return (p_coef[0] * num0 / (1 + f_coef[0] * fZI_u) ** pow5_3
+                * np.sqrt((fz_u ** 2 + (0.3 * z_ZI) ** 2) / (fz_u ** 2 + 0.0225))
+                + p_coef[1] * num1 / (1 + f_coef[1] * fz_u ** pow5_3))
 
 
 def smooth(Ustar, Ri, ZI=None):
@@ -0,0 +1,197 @@
+"""
+This module defines a store of the correlated phases of a PyTurbSim
+run.
+
+In :meth:`tsrun._calcTimeSeries <pyts.main.tsrun._calcTimeSeries>` the
+spectral amplitude is applied only after the random phases are
+correlated by the stress and coherence models, so the correlated
+phases do not depend on the spectral model (except through the stress
+correlation), and depend on the mean profile only through the
+coherence inputs. A run that changes only the spectral model (e.g. a
+sweep of turbulence-intensity classes) can therefore reuse the
+correlated phases of a previous run, and only scales them by the new
+spectral amplitude and computes the inverse fft.
+
+Example usage
+-------------
+
+>>> import pyts.api as pyts
+>>> tsr = pyts.tsrun(RandSeed=1234, phase_store=pyts.phaseStore())
+>>> ...  # Define the grid, profile, coherence and stress.
+>>> for ti in ['A', 'B', 'C']:
+...     tsr.reset()
+...     tsr.spec = pyts.specModels.iecvkm('NTM', 1, 3, ti)
+...     out = tsr()
+
+"""
+from .base import np, ts_complex
+from .cohereModels.cache import factorCache
+from numpy.lib.format import open_memmap
+from os import path
+import os
+
+
+def _params(obj):
+    """
+    The class name and (numeric or string) parameters of `obj` (e.g.
+    the tolerance of an approximate coherence backend).
+    """
+    return [obj.__class__.__name__] + \
+        [(nm, val) for nm, val in sorted(vars(obj).items())
+         if isinstance(val, (int, float, basestring))]
+
+
+class phaseStore(object):
+
+    """
+    A store of the correlated phases (3 x n_p x n_f) of a PyTurbSim
+    run.
+
+    A run that uses the store (see the `phase_store` parameter of
+    :class:`tsrun <pyts.main.tsrun>`) reuses the stored phases if
+    they were computed with the same inputs (see :meth:`key`).
+    Otherwise the phases are computed and stored. The output of a run
+    that reuses the phases is identical to that of a run that computes
+    them.
+
+    Parameters
+    ----------
+    filename : str, optional
+               The .npy file in which to store the phases (as a
+               memory-map). The random-number generator state and key
+               of the phases are stored in `filename` + '.state.npz',
+               so that the phases can be reused by other processes.
+               By default the phases are stored in memory.
+
+    Notes
+    -----
+    The phases are reused only if the run's random-number generator
+    is in the same state as that of the run that computed them
+    (e.g. call :meth:`tsrun.reset <pyts.main.tsrun.reset>` before each
+    run of a sweep).
+
+    The stress correlation (the Reynold's stress divided by the
+    product of the standard deviations) depends on the spectral
+    model, so the phases are reused for a different spectral model
+    only if the stress correlation is unchanged (e.g. with zero
+    Reynold's stress).
+
+    The phases are not reused for coherence objects that do not define
+    their coherence inputs (see :meth:`cohereObj._cache_inputs
+    <pyts.cohereModels.base.cohereObj._cache_inputs>`), and the store
+    is not used by :meth:`tsrun.run_ensemble
+    <pyts.main.tsrun.run_ensemble>`.
+
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.phases = None
+        self.randstate = None
+        self._key = None
+        if filename is not None and path.isfile(self._state_file):
+            self._load()
+
+    def __repr__(self,):
+        if self._key is None:
+            return '<PyTurbSim phase store: empty>'
+        return '<PyTurbSim phase store: %s (%0.1f MB)>' % (
+            self.filename or 'memory', self.phases.nbytes / 1e6)
+
+    @property
+    def _state_file(self,):
+        return self.filename + '.state.npz'
+
+    def _load(self,):
+        dat = np.load(self._state_file)
+        self.randstate = ('MT19937', dat['keys'], int(dat['pos']),
+                          int(dat['has_gauss']), float(dat['gauss']))
+        self.phases = np.load(self.filename, mmap_mode='r')
+        self._key = str(dat['key'])
+
+    def _save(self,):
+        state = self.randstate
+        np.savez(self._state_file, key=self._key,
+                 keys=state[1], pos=state[2], has_gauss=state[3],
+                 gauss=state[4])
+        self.phases.flush()
+
+    def clear(self,):
+        """
+        Remove the phases from the store.
+        """
+        self._key = None
+        self.phases = None
+        self.randstate = None
+
+    @staticmethod
+    def key(tsrun):
+        """
+        Compute the key of the correlated phases of `tsrun`.
+
+        The phases depend on the grid, the random-number generator
+        state, the phase model, the frequency blocks, the stress
+        correlation and the coherence inputs. This returns None if the
+        coherence inputs are unknown (i.e. the phases can not be
+        reused).
+        """
+        cohi = tsrun.cohere
+        inputs = []
+        for comp in cohi._coh_comps:
+            inp = cohi._cache_inputs(comp)
+            if inp is None:
+                return None
+            inputs += list(inp)
+        backend = cohi.backend
+        if backend is not None and not isinstance(backend, basestring):
+            backend = _params(backend)
+        state = tsrun.randgen.get_state()
+        grid = tsrun.grid
+        return factorCache.key(
+            grid.y, grid.z, grid.f, state[1], state[2:], tsrun.RandSeed,
+            _params(tsrun.phase), tsrun._fblock_size(), tsrun.stress.corr,
+            cohi.__class__.__name__, cohi.tol, backend, *inputs)
+
+    def get(self, key):
+        """
+        Return the stored phases if they have the key `key` (otherwise
+        None).
+        """
+        if key is None or key != self._key:
+            return None
+        return self.phases
+
+    def begin(self, shape):
+        """
+        Clear the store, and allocate an array for phases of `shape`
+        (which are written with :meth:`write`, and become available
+        with :meth:`commit`).
+        """
+        self.clear()
+        if self.filename is None:
+            self.phases = np.empty(shape, dtype=ts_complex, order='F')
+        else:
+            # The key of the previous phases is no longer valid.
+            if path.isfile(self._state_file):
+                os.remove(self._state_file)
+            self.phases = open_memmap(self.filename, mode='w+',
+                                      dtype=ts_complex, shape=shape,
+                                      fortran_order=True)
+
+    def write(self, fslice, phases):
+        """
+        Write the correlated `phases` of the block of frequencies
+        `fslice` (a slice into `grid.f`) to the store (see
+        :meth:`begin`).
+        """
+        self.phases[..., fslice] = phases
+
+    def commit(self, key, randstate):
+        """
+        Set the key of the (completely computed) phases, and the state
+        of the random-number generator after they were computed.
+        """
+        self._key = key
+        self.randstate = randstate
+        if self.filename is not None:
+            self._save()
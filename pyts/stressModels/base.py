@@ -9,6 +9,9 @@ stress
 from .. import base
 np = base.np
 
+# The range of the random integers of stressObj.calc_phases.
+rnd_scale = 2 ** 24
+
 
 class stressModelBase(base.modelBase):
     pass
@@ -19,14 +22,58 @@ class stressObj(base.calcObj, base.gridProps):
     def __init__(self, tsrun):
         self.grid = tsrun.grid
         self.randgen = tsrun.randgen
+        self.spec = tsrun.spec
         self.array = np.zeros(
             [3] + self.grid.shape, dtype=base.ts_float, order='F')
-        self.spec = tsrun.spec
-        std_u = np.sqrt(self.spec.tke)
-        self.stress_max = np.empty_like(self.array)
-        self.stress_max[0] = std_u[0] * std_u[1]  # u'v'
-        self.stress_max[1] = std_u[0] * std_u[2]  # u'w'
-        self.stress_max[2] = std_u[1] * std_u[2]  # v'w'
+
+    @property
+    def array(self,):
+        """
+        The Reynold's stress array (3 x n_z x n_y).
+        """
+        return self._array
+
+    @array.setter
+    def array(self, val):
+        self._array = val
+        self._clear_cache()
+
+    def __setitem__(self, ind, val):
+        base.calcObj.__setitem__(self, ind, val)
+        self._clear_cache()
+
+    def _clear_cache(self,):
+        """
+        Clear the cached correlation, validity and overlap (see
+        :attr:`validity`).
+
+        These are computed once, and cached. They are cleared when the
+        array (or one of the stress components, e.g. `upvp_`) is set,
+        but not when the array is modified in-place (call this method
+        to clear them in that case).
+        """
+        for nm in ['_corr', '_validity', '_overlap']:
+            if nm in self.__dict__:
+                delattr(self, nm)
+
+    @property
+    def stress_max(self,):
+        """
+        The product of the standard deviations of the velocity
+        components (u'v', u'w', v'w'), i.e. the maximum stress for the
+        given turbulence model (3 x n_z x n_y).
+
+        This is computed once (from the tke of the spectral model),
+        and cached.
+        """
+        if not hasattr(self, '_stress_max'):
+            std_u = np.sqrt(self.spec.tke)
+            out = np.empty(std_u.shape, dtype=base.ts_float, order='F')
+            out[0] = std_u[0] * std_u[1]  # u'v'
+            out[1] = std_u[0] * std_u[2]  # u'w'
+            out[2] = std_u[1] * std_u[2]  # v'w'
+            self._stress_max = out
+        return self._stress_max
 
     @property
     def upvp_max(self,):
@@ -62,6 +109,7 @@ class stressObj(base.calcObj, base.gridProps):
     @upvp_.setter
     def upvp_(self, val):
         self.array[0] = val
+        self._clear_cache()
 
     @property
     def upwp_(self,):
@@ -73,6 +121,7 @@ class stressObj(base.calcObj, base.gridProps):
     @upwp_.setter
     def upwp_(self, val):
         self.array[1] = val
+        self._clear_cache()
 
     @property
     def vpwp_(self,):
@@ -84,10 +133,17 @@ class stressObj(base.calcObj, base.gridProps):
     @vpwp_.setter
     def vpwp_(self, val):
         self.array[2] = val
+        self._clear_cache()
 
     @property
     def corr(self,):
-        return self.array / self.stress_max
+        """
+        The correlation between the velocity components (the stress
+        divided by :attr:`stress_max`, 3 x n_z x n_y).
+        """
+        if not hasattr(self, '_corr'):
+            self._corr = self.array / self.stress_max
+        return self._corr
 
     @property
     def validity(self,):
@@ -107,14 +163,42 @@ class stressObj(base.calcObj, base.gridProps):
              correlations can exceed one if they overlap. However,
              their are limits to the overlap. This criteria indicates
              that limit has been exceeded.
-          2) The 'sign' criteria. If only one component is negative
-             than they can not overlap. In this case the sum of
-             magnitude of the correlations must be less than 1.
+          2) The 'sign' criteria. If one (or three) of the
+             components are negative than they can not overlap. In
+             this case the sum of magnitude of the correlations must
+             be less than 1.
+
+        Together, these criteria ensure that the categories of
+        :meth:`calc_phases` (which are selected with the probabilities
+        of the correlations, less the :attr:`overlap`) fit in the unit
+        interval, i.e. that the stresses are reproduced.
 
         If any of the criteria are false at any point, than the
         stressModel is invalid at that point.
+
+        The validity (and the :attr:`overlap`) is computed once, and
+        cached (see :meth:`_clear_cache`).
+        """
+        if not hasattr(self, '_validity'):
+            self._calc_validity()
+        return self._validity
+
+    @property
+    def overlap(self,):
+        """
+        The 'overlap' (n_z x n_y), i.e. the fraction of the
+        frequencies that have the same phase for all three components
+        (see :attr:`validity` and :meth:`calc_phases`).
         """
-        srt = np.sort(np.abs(self.corr))
+        if not hasattr(self, '_overlap'):
+            self._calc_validity()
+        return self._overlap
+
+    def _calc_validity(self,):
+        """
+        Compute the :attr:`validity` and the :attr:`overlap`.
+        """
+        srt = np.sort(np.abs(self.corr), axis=0)
         valid = np.empty(srt.shape, dtype=bool)
 
         # All individual stresses must be less than stress_max
@@ -125,9 +209,12 @@ class stressObj(base.calcObj, base.gridProps):
         # This is the 'overlap' criterion.
         valid[1] = (1 + srt[0] - srt[1] - srt[2] > 0)
 
-        # This is the 'sign' criterion: if there is only one negative
-        # stress, their can be no overlap (sum(srt) must be <1).
-        valid[2] = ((self.array < 0).sum(0) != 1) | (srt.sum(0) <= 1)
+        # This is the 'sign' criterion: if there is one (or three)
+        # negative stress(es), the phases of the three components can
+        # not be the same (the product of the signs of the stresses is
+        # negative), so there can be no overlap (sum(srt) must be <1).
+        one_neg = (self.array < 0).sum(0) % 2 == 1
+        valid[2] = ~one_neg | (srt.sum(0) <= 1)
         ############################
         # Now compute the 'overlap' (so that we don't have to redo or
         # store the sort for calc_phases).  average the product of the
@@ -138,11 +225,16 @@ class stressObj(base.calcObj, base.gridProps):
         #
         # Note, this is specific choice of how the three components are
         # correlated.
-        self._overlap = np.minimum((srt[0] * srt[1] + srt[0] * srt[2]) / 2, srt[0])
+        overlap = np.minimum((srt[0] * srt[1] + srt[0] * srt[2]) / 2, srt[0])
+        # The categories of calc_phases (the sum of the correlations,
+        # less twice the overlap) must fit in the unit interval, so
+        # the overlap is at least (sum(srt) - 1) / 2. This is no more
+        # than srt[0] if the 'overlap' criterion is met.
+        overlap = np.maximum(overlap, (srt.sum(0) - 1) / 2)
         # If there is only 1 negative stress than the overlap must be zero (if they are valid):
-        self._overlap[(self.array < 0).sum(0) == 1] = 0
-        #pdb.set_trace()
-        return valid
+        overlap[one_neg] = 0
+        self._validity = valid
+        self._overlap = overlap
 
     def check_validity(self,):
         """
@@ -156,46 +248,62 @@ class stressObj(base.calcObj, base.gridProps):
             print self.validity
             raise Exception('The input reynolds stresses are inconsistent.')
 
-    def calc_phases(self, phases):
+    def calc_phases(self, phases, randgen=None):
         """
         Here we control the Reynold's stress by setting the phases
         between components to be the same for a fraction of the
         frequencies.
+
+        `phases` may contain all frequencies, or a block of them
+        (i.e. the shape of `phases` is 3 x n_p x n_f, where n_f may be
+        less than grid.n_f).
+
+        The random numbers are drawn from `randgen` (default:
+        the random number generator of the tsrun).
+
+        Notes
+        -----
+        One uniform random number is drawn for each point and
+        frequency. It selects one of the following categories, with
+        probabilities that are the stress correlations (less the
+        'overlap', see :attr:`validity`):
+
+          - overlap (see :attr:`overlap`): the v and w phases are set
+            to the u phase (or its opposite, according to the sign of
+            the stresses).
+          - u'v': the v phase is set to the u phase.
+          - u'w': the w phase is set to the u phase.
+          - v'w': the w phase is set to the v phase.
+          - none: the phases are independent.
+
+        The phases are modified in place.
         """
         self.check_validity()
-        rgen = self.randgen.rand
+        if randgen is None:
+            randgen = self.randgen
         if (self.array == 0).all():
             return phases  # No stress, so the phases are independently-random.
-        # fudge_factor=0.93 #!!!FIXTHIS: The 0.93 is a fudge factor to account
-        # for ... ???
-        fudge_factor = 1
-        rstrmat = self.grid.flatten(self.corr)[..., None]
-        shp = (self.grid.n_p, self.grid.n_f)
-
-        ####
-        # First we set the 'overlap' stress. i.e. the phases that are the same
-        # (or opposite) for all three components.
-        # This is computed during check_validity:
-        ovr = self.grid.flatten(self._overlap)[:, None]
-        inds_used = (rgen(*shp) * fudge_factor) < ovr
-        phases[2][inds_used] = (np.sign(rstrmat[1]) * phases[0])[inds_used]
-        phases[1][inds_used] = (np.sign(rstrmat[0]) * phases[0])[inds_used]
-        ####
-        # Now set the u'v' non-overlap piece.
-        inds = ((rgen(*shp) * fudge_factor) <
-                np.abs(rstrmat[0]) - ovr) & (~inds_used)
-        phases[1][inds] = (np.sign(rstrmat[0]) * phases[0])[inds]
-        inds_used |= inds
-        ####
-        # Now set the u'w' non-overlap piece.
-        inds = ((rgen(*shp) * fudge_factor) <
-                np.abs(rstrmat[1]) - ovr) & (~inds_used)
-        phases[2][inds] = (np.sign(rstrmat[1]) * phases[0])[inds]
-        inds_used |= inds
-        ####
-        # Now set the v'w' non-overlap piece.
-        inds = ((rgen(*shp) * fudge_factor) <
-                np.abs(rstrmat[2]) - ovr) & (~inds_used)
-        phases[2][inds] = (np.sign(rstrmat[2]) * phases[1])[inds]
-        inds_used |= inds
+        shp = phases.shape[1:]
+        bshp = shp[:1] + (1, ) * (len(shp) - 1)
+        corr = self.grid.flatten(self.corr).reshape((3, ) + bshp)
+        sgn = np.sign(corr)
+        # The upper limits of the categories.
+        ovr = self.grid.flatten(self.overlap).reshape(bshp)
+        lim = np.cumsum([ovr, ] + [np.abs(c) - ovr for c in corr], axis=0)
+        # The uniform random numbers are drawn as (uint32) integers in
+        # [0, 2**24), and compared with the limits scaled by 2**24. This
+        # has the resolution of float32 values (RandomState can not
+        # draw float32 values, and rand() would allocate float64
+        # values).
+        lim = (lim * rnd_scale + 0.5).astype(np.uint32)
+        rnd = randgen.randint(0, rnd_scale, size=shp, dtype=np.uint32)
+        # v'w' (this reads the v phases, which are not modified for
+        # these points).
+        np.multiply(phases[1], sgn[2], out=phases[2],
+                    where=(rnd >= lim[2]) & (rnd < lim[3]))
+        # overlap and u'v'
+        np.multiply(phases[0], sgn[0], out=phases[1], where=rnd < lim[1])
+        # overlap and u'w'
+        np.multiply(phases[0], sgn[1], out=phases[2],
+                    where=(rnd < lim[0]) | ((rnd >= lim[1]) & (rnd < lim[2])))
         return phases
@@ -1,7 +1,21 @@
 # The setup script for installing pyTurbSim.
 from numpy.distutils.core import setup, Extension
+from numpy.distutils.system_info import get_info
 from pyts import _version as ver
 
+# tslib is linked to an optimized LAPACK/BLAS library when one is
+# available. Otherwise the reference (netlib) routines that it uses are
+# compiled from pyts/tslib/lapack.
+tslib_sources = ['pyts/tslib/tslib.pyf',
+                 'pyts/tslib/tslib.f95', ]
+tslib_kw = get_info('lapack_opt', 0)
+tslib_kw.pop('language', None)
+if not tslib_kw:
+    tslib_sources += ['pyts/tslib/lapack/' + nm + '.f' for nm in
+                      ['lsame', 'sdot', 'spptrf', 'sscal', 'sspr',
+                       'stpmv', 'stpsv', 'strmm', 'xerbla', ]]
+tslib_kw['extra_link_args'] = tslib_kw.get('extra_link_args', []) + ['-lgomp']
+
 setup(name='PyTurbSim',
       version=ver.__version__,
       description='Python implementation of TurbSim',
@@ -33,15 +47,6 @@ setup(name='PyTurbSim',
                'gTurbSim.py',
                ],
       ext_modules=[Extension('pyts.tslib',
-                             sources=['pyts/tslib/tslib.pyf',
-                                      'pyts/tslib/tslib.f95',
-                                      'pyts/tslib/lapack/lsame.f',
-                                      'pyts/tslib/lapack/sdot.f',
-                                      'pyts/tslib/lapack/spptrf.f',
-                                      'pyts/tslib/lapack/sscal.f',
-                                      'pyts/tslib/lapack/sspr.f',
-                                      'pyts/tslib/lapack/stpsv.f',
-                                      'pyts/tslib/lapack/xerbla.f', ],
-                             extra_link_args=['-lgomp'],
-                             )],
+                             sources=tslib_sources,
+                             **tslib_kw)],
       )
@@ -0,0 +1,100 @@
+"""
+Small PyTurbSim runs, and coherence checks, that are shared by the
+tests in this directory.
+
+The tests use the standard-library :mod:`unittest` module, so they run
+with::
+
+    python -m unittest discover -s test
+
+(or with pytest, if it is installed).
+"""
+import sys
+from os import path
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..'))
+import pyts.api as pyts
+from pyts.cohereModels import backends
+import numpy as np
+
+# Do not store the backend benchmark timings (in the home directory)
+# during the tests.
+backends.bench_file = None
+
+
+def make(case='nwtc', RandSeed=1234, ny=5, nz=4, **kwargs):
+    """
+    Create a small PyTurbSim run.
+
+    Parameters
+    ----------
+    case : {'nwtc', 'iec', 'stress'}
+           The models of the run:
+
+           - 'nwtc': the tidal spectral and stress models and the
+             NWTC coherence.
+           - 'iec': the IEC Von-Karman spectrum and coherence, with
+             zero Reynold's stress.
+           - 'stress': the 'smooth' spectral model, the NWTC coherence
+             and a uniform (non-zero) Reynold's stress.
+    RandSeed : int
+    ny, nz : int
+             The size of the grid.
+    kwargs : The other inputs to :class:`tsrun <pyts.main.tsrun>`.
+    """
+    tsr = pyts.tsrun(RandSeed=RandSeed, **kwargs)
+    tsr.grid = pyts.tsGrid(center=30, ny=ny, nz=nz, height=10, width=12,
+                           time_sec=60, dt=0.5)
+    if case == 'nwtc':
+        tsr.prof = pyts.profModels.pl(3, 30)
+        tsr.spec = pyts.specModels.tidal(0.1, 30)
+        tsr.cohere = pyts.cohereModels.nwtc()
+        tsr.stress = pyts.stressModels.tidal(0.02, 40)
+    elif case == 'iec':
+        tsr.prof = pyts.profModels.pl(10, 30)
+        tsr.spec = pyts.specModels.iecvkm('NTM', 1, 3, 'B')
+        tsr.cohere = pyts.cohereModels.iec()
+        tsr.stress = pyts.stressModels.uniform(0.0, 0.0, 0.0)
+    elif case == 'stress':
+        tsr.prof = pyts.profModels.log(8, 30, 0.05)
+        tsr.spec = pyts.specModels.smooth(0.5, 0.05)
+        tsr.cohere = pyts.cohereModels.nwtc(a=[5., 3., 3.],
+                                            b=[0.01, 0.02, 0.02],
+                                            CohExp=0.3)
+        tsr.stress = pyts.stressModels.uniform(0.01, -0.01, 0.005)
+    else:
+        raise ValueError("Unknown case '%s'." % case)
+    return tsr
+
+
+def realized_coherence(backend, cohi, comp, f):
+    """
+    The coherence (nf x np x np) that the (linear) coherence
+    `backend` reproduces for component `comp` of the coherence object
+    `cohi` at the frequencies `f`.
+
+    The backend correlates the columns of the identity matrix, which
+    gives the matrix, F, that it applies to the phases. The coherence
+    of the correlated phases is F F^H.
+    """
+    n_p = cohi.n_p
+    tmp = np.empty((n_p, n_p, len(f)), dtype=np.complex64, order='F')
+    tmp[:] = np.eye(n_p)[:, :, None]
+    backend(cohi, tmp, comp, f)
+    fac = tmp.transpose(2, 0, 1).astype(np.complex128)
+    return np.matmul(fac, fac.conj().transpose(0, 2, 1)).real
+
+
+def sampled_coherence(backend, cohi, comp, f, n_rhs=4000, seed=0):
+    """
+    The coherence (nf x np x np) of `n_rhs` sets of random phases
+    that are correlated by the coherence `backend` (for backends that
+    are not linear in the phases).
+
+    The sampling error of each value is roughly 1/sqrt(n_rhs).
+    """
+    rng = np.random.RandomState(seed)
+    tmp = np.asfortranarray(np.exp(
+        2j * np.pi * rng.rand(cohi.n_p, n_rhs, len(f))).astype(np.complex64))
+    backend(cohi, tmp, comp, f)
+    ph = tmp.transpose(2, 0, 1).astype(np.complex128)
+    return np.matmul(ph, ph.conj().transpose(0, 2, 1)).real / n_rhs
@@ -0,0 +1,334 @@
+"""
+Tests of the coherence backends (see :mod:`pyts.cohereModels.backends`).
+"""
+from cases import pyts, np, make, realized_coherence, sampled_coherence
+from pyts.cohereModels import backends
+from pyts.base import tslib
+from os import path
+import tempfile
+import shutil
+import unittest
+
+
+def coh_error(backend, cohi, f, comps=None):
+    """
+    The largest error in the coherence that the (linear) `backend`
+    reproduces for the components `comps` (default: the correlated
+    components) of `cohi`.
+    """
+    if comps is None:
+        comps = cohi._coh_comps
+    return max([np.abs(realized_coherence(backend, cohi, comp, f) -
+                       cohi.calcCohMatrix(f, comp)).max()
+                for comp in comps])
+
+
+class coherenceTest(unittest.TestCase):
+
+    # The float32 factors reproduce the coherence to roughly this
+    # accuracy.
+    eps = 1e-4
+
+    def test_cholesky(self,):
+        for case in ['nwtc', 'iec']:
+            cohi = make(case).cohere
+            f = cohi.grid.f
+            self.assertLess(coh_error(backends.numpyBackend(), cohi, f),
+                            self.eps)
+            if backends.tslibBackend.available(cohi):
+                self.assertLess(coh_error(backends.tslibBackend(), cohi, f),
+                                self.eps)
+
+    def test_toeplitz(self,):
+        cohi = make('nwtc').cohere
+        self.assertTrue(pyts.cohereModels.toeplitzBackend.available(cohi))
+        self.assertLess(coh_error(pyts.cohereModels.toeplitzBackend(),
+                                  cohi, cohi.grid.f), self.eps)
+
+    def test_circulant(self,):
+        # The circulant backend is not linear in the phases, so the
+        # coherence of many sets of phases is compared (the sampling
+        # error is roughly 1/sqrt(n_rhs) = 0.016).
+        cohi = make('iec').cohere
+        f = cohi.grid.f[::12]
+        for comp in cohi._coh_comps:
+            coh = sampled_coherence(pyts.cohereModels.circulantBackend(),
+                                    cohi, comp, f)
+            self.assertLess(np.abs(coh - cohi.calcCohMatrix(f, comp)).max(),
+                            0.1)
+        self.assertEqual(cohi.info['backend'], 'circulant')
+
+    def test_sparse(self,):
+        for case in ['nwtc', 'iec']:
+            for reorder in [True, False]:
+                cohi = make(case).cohere
+                backend = pyts.cohereModels.sparseBackend(threshold=0.05,
+                                                          reorder=reorder)
+                err = coh_error(backend, cohi, cohi.grid.f)
+                # The error is the largest dropped coherence.
+                self.assertLessEqual(cohi.info['coh_error'], 0.05)
+                self.assertLess(err, cohi.info['coh_error'] + self.eps)
+                self.assertGreaterEqual(cohi.info['fill_ratio'], 1)
+
+    def test_fsubset(self,):
+        for case in ['nwtc', 'iec']:
+            cohi = make(case).cohere
+            backend = pyts.cohereModels.freqSubsetBackend(tol=0.05)
+            err = coh_error(backend, cohi, cohi.grid.f)
+            info = cohi.info
+            self.assertGreater(info['n_reused'], 0)
+            self.assertEqual(info['n_factored'] + info['n_reused'],
+                             len(cohi._coh_comps) * cohi.grid.n_f)
+            # The reported bound holds.
+            self.assertLessEqual(info['coh_error'], 0.05)
+            self.assertLess(err, info['coh_error'] + self.eps)
+
+    def test_bank(self,):
+        bank = pyts.cohereModels.factorBank(tol=0.01)
+        cohi = make('iec').cohere
+        f = cohi.grid.f
+        self.assertLess(coh_error(bank, cohi, f, (0, )), self.eps)
+        self.assertEqual(cohi.info['n_factored'], len(f))
+        # A different wind speed reuses (scaled) factors from the
+        # bank.
+        tsr = make('iec')
+        tsr.prof = pyts.profModels.pl(11, 30)
+        cohi = tsr.cohere
+        err = coh_error(bank, cohi, f, (0, ))
+        self.assertGreater(cohi.info['n_reused'], 0)
+        self.assertLessEqual(cohi.info['coh_error'], 0.01)
+        self.assertLess(err, cohi.info['coh_error'] + self.eps)
+
+    def test_tol(self,):
+        tol = 0.05
+
+        def correlate_tol(cohi, tmp, comp, f):
+            cohi._correlate_group_tol(tmp, comp, f)
+
+        for case in ['nwtc', 'iec']:
+            cohi = make(case).cohere
+            cohi.tol = tol
+            f = cohi.grid.f
+            n_f = len(f)
+            # The neglected coherence is less than tol.
+            for comp in cohi._coh_comps:
+                cohi.info.clear()
+                err = coh_error(correlate_tol, cohi, f, (comp, ))
+                self.assertLess(err, tol)
+                info = cohi.info
+                self.assertEqual(info['n_freq'], n_f)
+                self.assertEqual(info['skipped_fraction'],
+                                 float(info['n_skipped']) / n_f)
+                # All coherence above the cutoff frequency is below
+                # tol.
+                coh = cohi.calcCohMatrix(f, comp)
+                coh[:, np.arange(cohi.n_p), np.arange(cohi.n_p)] = 0
+                cmax = coh.max(-1).max(-1)
+                above = f > info['cutoff_freq']
+                self.assertTrue((cmax[above] < tol).all())
+                self.assertEqual(info['n_skipped'], (cmax < tol).sum())
+        # The model's tolerance is reported in the run's info.
+        tsr = make('iec')
+        tsr.cohere.tol = tol
+        tsr()
+        self.assertEqual(tsr.cohere.info['tol'], tol)
+        self.assertGreater(tsr.cohere.info['skipped_fraction'], 0)
+
+
+def lowrank_run(n=24):
+    """
+    A run with strongly coherent (low-rank) coherence at low
+    frequencies.
+    """
+    tsr = make('nwtc', ny=n, nz=n)
+    tsr.grid = pyts.tsGrid(center=30, ny=n, nz=n, height=2, width=2,
+                           time_sec=20, dt=1)
+    tsr.cohere = pyts.cohereModels.nwtc(a=[0.5] * 3, b=[0., 0., 0.])
+    tsr.stress = pyts.stressModels.uniform(0., 0., 0.)
+    return tsr
+
+
+class lowRankTest(unittest.TestCase):
+
+    def test_modes(self,):
+        # The coherence of all frequencies is represented by a few
+        # modes. (The estimated speedup is reported, but it is a
+        # wall-clock timing, so it is not checked.)
+        cohi = lowrank_run().cohere
+        f = cohi.grid.f[:10]
+        rng = np.random.RandomState(0)
+        ph = np.asfortranarray(np.exp(
+            2j * np.pi * rng.rand(cohi.n_p, 1, len(f))).astype(np.complex64))
+        pyts.cohereModels.lowRankBackend()(cohi, ph, 0, f)
+        self.assertEqual(cohi.info['n_freq_lowrank'], len(f))
+        self.assertLess(cohi.info['max_modes'], 0.1 * cohi.n_p)
+        self.assertIn('speedup', cohi.info)
+
+    def test_coherence(self,):
+        cohi = lowrank_run().cohere
+        f = cohi.grid.f[:10]
+        coh = realized_coherence(pyts.cohereModels.lowRankBackend(),
+                                 cohi, 0, f)
+        # The truncation drops 1% of the trace of the coherence.
+        self.assertLess(np.abs(coh - cohi.calcCohMatrix(f, 0)).max(), 0.05)
+        # The variance at each point is preserved.
+        self.assertLess(np.abs(coh[:, np.arange(cohi.n_p),
+                                   np.arange(cohi.n_p)] - 1).max(), 1e-5)
+
+
+class cacheTest(unittest.TestCase):
+
+    def setUp(self,):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache = pyts.cohereModels.factorCache(self.tmpdir)
+        self.n_put = 0
+        put = self.cache.put
+
+        def count_put(key, fac):
+            self.n_put += 1
+            put(key, fac)
+        self.cache.put = count_put
+
+    def tearDown(self,):
+        shutil.rmtree(self.tmpdir)
+
+    def run_cached(self, case, **kwargs):
+        backend = backends.cacheBackend(self.cache)
+        return make(case, cohere_backend=backend, **kwargs)().uturb
+
+    def test_hit(self,):
+        for case in ['nwtc', 'iec']:
+            ref = make(case, cohere_backend='numpy')().uturb
+            out = self.run_cached(case)
+            n_put = self.n_put
+            self.assertGreater(n_put, 0)
+            # The second run loads the factors from the cache, and
+            # reproduces the output of the first run.
+            self.assertTrue((self.run_cached(case) == out).all())
+            self.assertEqual(self.n_put, n_put)
+            self.assertLess(np.abs(out - ref).max(), 1e-5 * np.abs(ref).max())
+            # A different seed uses the same factors.
+            self.run_cached(case, RandSeed=11)
+            self.assertEqual(self.n_put, n_put)
+
+    def test_key(self,):
+        # The key depends on the coherence parameters.
+        key = self.cache.key(*make('nwtc').cohere._cache_inputs(0))
+        tsr = make('nwtc')
+        tsr.cohere = pyts.cohereModels.nwtc(a=[9., 8., 7.])
+        self.assertNotEqual(self.cache.key(*tsr.cohere._cache_inputs(0)), key)
+        # Blocks of frequencies are separate entries.
+        self.run_cached('nwtc')
+        n_put = self.n_put
+        self.run_cached('nwtc', block_size=13)
+        self.assertGreater(self.n_put, n_put)
+
+    def test_tol(self,):
+        # The cache can not neglect coherence below a tolerance: it is
+        # not selected automatically, and it raises an error when it
+        # is set explicitly.
+        tsr = make('nwtc')
+        tsr.cohereModel.cache = self.cache
+        tsr.cohereModel.tol = 0.05
+        ref = tsr().uturb
+        self.assertEqual(self.n_put, 0)
+        self.assertEqual(tsr.cohere.info['tol'], 0.05)
+        tsr = make('nwtc', cohere_backend=backends.cacheBackend(self.cache))
+        tsr.cohereModel.tol = 0.05
+        self.assertRaises(Exception, tsr)
+        self.assertEqual(self.n_put, 0)
+
+    def test_evict(self,):
+        self.run_cached('nwtc')
+        size = self.cache.size
+        self.assertGreater(size, 0)
+        self.cache.evict(size // 2)
+        self.assertLessEqual(self.cache.size, size // 2)
+        self.cache.clear()
+        self.assertEqual(self.cache.size, 0)
+
+
+class tslibTest(unittest.TestCase):
+
+    @unittest.skipIf(tslib is None, 'tslib is not built')
+    def test_large_grid(self,):
+        # The packed coherence matrix of this grid (8.2 MB) does not
+        # fit on a default (8 MB) stack.
+        n = 45
+        for case in ['iec', 'nwtc']:
+            outs = []
+            for backend in ['tslib', 'numpy']:
+                tsr = make(case, ny=n, nz=n, ncore=2,
+                           cohere_backend=backend)
+                tsr.grid = pyts.tsGrid(center=30, ny=n, nz=n, height=10,
+                                       width=12, time_sec=4, dt=1)
+                outs.append(tsr().uturb)
+                self.assertEqual(tsr.cohere.info['backend'], backend)
+            self.assertLess(np.abs(outs[0] - outs[1]).max(),
+                            1e-4 * np.abs(outs[1]).max())
+
+
+class selectTest(unittest.TestCase):
+
+    def setUp(self,):
+        self.tmpdir = tempfile.mkdtemp()
+        self.bench_file = backends.bench_file
+
+    def tearDown(self,):
+        backends.bench_file = self.bench_file
+        shutil.rmtree(self.tmpdir)
+
+    def test_bench_file(self,):
+        cohi = make('nwtc', ny=8, nz=8).cohere
+        names = ['numpy', 'sparse']
+        # (the tests do not store the timings)
+        self.assertIsNone(backends.bench_file)
+        self.assertEqual(sorted(backends.benchmark(cohi, names)), names)
+        self.assertEqual(backends._load_bench(), {})
+        backends.bench_file = path.join(self.tmpdir, 'bench.json')
+        times = backends.benchmark(cohi, names)
+        self.assertTrue(path.isfile(backends.bench_file))
+        # The stored timings are reused.
+        self.assertEqual(backends.benchmark(cohi, names), times)
+
+    def test_cholesky_only(self,):
+        # The toeplitz (nwtc) and circulant (iec) backends are
+        # supported on these grids, but are not selected
+        # automatically.
+        for case in ['nwtc', 'iec']:
+            tsr = make(case, ny=10, nz=10)
+            name = backends.select(tsr.cohere).name
+            self.assertIn(name, ('tslib', 'numpy'))
+
+    def test_same_timeseries(self,):
+        # The time-series of the selected backend are those of the
+        # NumPy (Cholesky) backend.
+        for case in ['nwtc', 'iec']:
+            out = make(case, ny=10, nz=10)().uturb
+            ref = make(case, ny=10, nz=10, cohere_backend='numpy')().uturb
+            self.assertLess(np.abs(out - ref).max(), 1e-3 * ref.std())
+
+    def test_opt_in(self,):
+        tsr = make('nwtc', cohere_backend='toeplitz')
+        tsr()
+        self.assertEqual(tsr.cohere.info['backend'], 'toeplitz')
+        tsr = make('iec', cohere_backend='circulant')
+        tsr()
+        self.assertEqual(tsr.cohere.info['backend'], 'circulant')
+
+    def test_nonuniform_grid(self,):
+        tsr = make('iec')
+        y = tsr.grid.y.copy()
+        y[1] += 0.5
+        tsr.grid.y = y
+        cohi = tsr.cohere
+        self.assertFalse(pyts.cohereModels.circulantBackend.available(cohi))
+        self.assertRaises(Exception, backends.get, 'circulant', cohi)
+        tsr = make('nwtc')
+        tsr.grid.y = y
+        self.assertFalse(
+            pyts.cohereModels.toeplitzBackend.available(tsr.cohere))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Tests of the vectorized (grid) computations of the models: the
+coherence matrices, grid geometry, stress and spectral objects.
+"""
+from cases import pyts, np, make
+import unittest
+
+
+class cohereMatrixTest(unittest.TestCase):
+
+    def test_pairs(self,):
+        # The all-pairs coherence matrix is that of the (single-pair)
+        # calcCoh method.
+        for case in ['nwtc', 'iec']:
+            cohi = make(case, ny=4, nz=3).cohere
+            f = cohi.grid.f[::7]
+            n_p = cohi.n_p
+            for comp in cohi._coh_comps:
+                coh = cohi.calcCohMatrix(f, comp)
+                self.assertEqual(coh.shape, (len(f), n_p, n_p))
+                for ii in range(n_p):
+                    for jj in range(n_p):
+                        ref = cohi.calcCoh(f, comp, ii, jj)
+                        self.assertLess(np.abs(coh[:, ii, jj] - ref).max(),
+                                        1e-5)
+
+
+class gridGeometryTest(unittest.TestCase):
+
+    def test_pairs(self,):
+        grid = make('nwtc', ny=4, nz=3).grid
+        ii, jj = grid.pair_inds
+        self.assertEqual(len(ii), grid.n_p * (grid.n_p + 1) // 2)
+        self.assertTrue((ii >= jj).all())
+        iz, iy = grid.sub_inds
+        for idx in range(0, len(ii), 5):
+            pi, pj = ii[idx], jj[idx]
+            self.assertEqual((iz[pi], iy[pi]), tuple(grid.ind2sub(pi)))
+            self.assertAlmostEqual(grid.pair_dist[idx],
+                                   grid.dist(pi, pj), 5)
+            self.assertAlmostEqual(grid.pair_zmean[idx],
+                                   (grid.z[iz[pi]] + grid.z[iz[pj]]) / 2., 5)
+        # The geometry is cached.
+        self.assertIs(grid.pair_dist, grid.pair_dist)
+
+    def test_invalidate(self,):
+        grid = make('nwtc', ny=4, nz=3).grid
+        dist = grid.pair_dist
+        zmean = grid.pair_zmean
+        grid.z = grid.z * 2
+        self.assertTrue(np.allclose(grid.pair_zmean, 2 * zmean))
+        grid.y = grid.y * 2
+        self.assertTrue(np.allclose(grid.pair_dist, 2 * dist))
+
+
+class stressCacheTest(unittest.TestCase):
+
+    def test_cache(self,):
+        st = make('stress').stress
+        corr = st.corr
+        self.assertIs(st.corr, corr)
+        self.assertIs(st.validity, st.validity)
+        self.assertTrue(np.allclose(corr, st.array / st.stress_max))
+        # Setting the array, or a component, clears the cache.
+        st.array = st.array * 2
+        self.assertTrue(np.allclose(st.corr, 2 * corr))
+        st.upvp_ = 0
+        self.assertTrue((st.corr[0] == 0).all())
+        st[1] = 0
+        self.assertTrue((st.corr[1] == 0).all())
+        st.array = (np.array([0.9, 0.9, 0.2])[:, None, None] *
+                    st.stress_max).astype(np.float32)
+        self.assertFalse(st.validity.all(0).any())
+
+    def test_tke(self,):
+        tsr = make('stress')
+        spec = tsr.spec
+        self.assertTrue(np.allclose(spec.tke,
+                                    np.trapz(spec.array, spec.f, axis=-1)))
+        self.assertTrue(np.allclose(tsr.stress.stress_max[0],
+                                    np.sqrt(spec.tke[0] * spec.tke[1])))
+
+
+class nwtcSpecTest(unittest.TestCase):
+
+    # The stable and unstable models.
+    models = [pyts.specModels.smooth(0.5, 0.05),
+              pyts.specModels.smooth(0.5, -0.05, 300)]
+
+    def check(self, tsr, model):
+        spec = model(tsr)
+        grid = tsr.grid
+        u = tsr.prof.u
+        for comp in range(3):
+            for iz in range(grid.n_z):
+                for iy in range(grid.n_y):
+                    ref = model.model(spec.f, grid.z[iz], u[iz, iy], comp,
+                                      grid.zhub)
+                    self.assertTrue(np.allclose(spec[comp][iz, iy], ref,
+                                                rtol=1e-5))
+        return spec
+
+    def test_points(self,):
+        # The spectra of the grid are those of each point.
+        for model in self.models:
+            tsr = make('stress', ny=3, nz=4)
+            spec = self.check(tsr, model)
+            # (the log profile is uniform in y)
+            self.assertEqual(spec.compact.shape[2], 1)
+            tsr.prof = tsr.prof.array * \
+                np.linspace(0.9, 1.1, 3)[None, None, :]
+            spec = self.check(tsr, model)
+            self.assertEqual(spec.compact.shape, spec.shape)
+
+
+class compactSpecTest(unittest.TestCase):
+
+    def test_views(self,):
+        for case, shape in [('iec', (3, 1, 1)), ('nwtc', (3, 4, 1))]:
+            tsr = make(case)
+            spec = tsr.spec
+            self.assertEqual(spec.compact.shape[:3], shape)
+            full = np.array(spec.array)
+            self.assertEqual(full.shape, spec.shape)
+            self.assertFalse(spec.array.flags.writeable)
+            self.assertTrue((spec.amplitude ** 2 -
+                             spec.compact <= 1e-6 * spec.compact).all())
+            self.assertTrue(np.allclose(spec.tke,
+                                        np.trapz(full, spec.f, axis=-1)))
+            self.assertTrue((spec.flat == spec.grid.flatten(full)).all())
+
+    def test_run(self,):
+        # A run with the reduced spectra is identical to one with the
+        # full spectral array.
+        for case in ['iec', 'nwtc']:
+            ref = make(case)().uturb
+            tsr = make(case)
+            tsr.spec = np.array(tsr.spec.array)
+            self.assertEqual(tsr.spec.compact.shape, tsr.spec.shape)
+            self.assertTrue((tsr().uturb == ref).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,368 @@
+"""
+Tests of the :class:`tsrun <pyts.main.tsrun>` synthesis (frequency
+blocks, ensembles).
+"""
+from cases import pyts, np, make
+from pyts.phaseModels.api import philoxPhase
+from pyts.phaseModels.base import phaseModelBase
+from pyts.ifft import irfftStage
+from pyts.cohereModels import backends, parallel
+from pyts.cohereModels.base import cohereUser
+from os import path
+import tempfile
+import shutil
+import unittest
+
+# With this memory limit (on the default grid) a single run uses
+# blocks of 45 frequencies, and an ensemble of three seeds uses blocks
+# of 5.
+max_memory = 1.6e5
+
+
+def run_seed(case, seed, **kwargs):
+    return make(case, RandSeed=seed, **kwargs)().uturb
+
+
+class fixedPhase(phaseModelBase):
+
+    """
+    A phase model that returns (blocks of) a fixed array of phases.
+    """
+
+    def __init__(self, phases):
+        self.phases = phases
+
+    def __call__(self, tsrun, fslice=slice(None), out=None):
+        if out is None:
+            return self.phases[..., fslice].copy(order='F')
+        out[:] = self.phases[..., fslice]
+        return out
+
+
+def random_phases(shape, seed=0):
+    rng = np.random.RandomState(seed)
+    return np.asfortranarray(np.exp(2j * np.pi * rng.rand(*shape)
+                                    ).astype(np.complex64))
+
+
+class blockTest(unittest.TestCase):
+
+    def run_fixed(self, case, **kwargs):
+        # With fixed phases and zero Reynold's stress, the run does
+        # not draw any random numbers before the inverse fft.
+        tsr = make(case, **kwargs)
+        tsr.stress = pyts.stressModels.uniform(0., 0., 0.)
+        tsr.phase = fixedPhase(random_phases((3, tsr.grid.n_p,
+                                              tsr.grid.n_f)))
+        return tsr().uturb
+
+    def test_blocks(self,):
+        # The blocked synthesis is the unblocked one.
+        for case in ['nwtc', 'iec']:
+            ref = self.run_fixed(case)
+            for kwargs in [dict(block_size=1), dict(block_size=13),
+                           dict(max_memory=max_memory)]:
+                out = self.run_fixed(case, **kwargs)
+                self.assertLess(np.abs(out - ref).max(),
+                                1e-5 * np.abs(ref).max())
+
+    def test_block_size(self,):
+        tsr = make('nwtc')
+        n_f = tsr.grid.n_f
+        self.assertEqual(tsr._fblock_size(), n_f)
+        self.assertEqual(make('nwtc', block_size=10 ** 6)._fblock_size(), n_f)
+        self.assertEqual(make('nwtc', block_size=0)._fblock_size(), 1)
+        # A larger memory limit gives larger blocks.
+        sizes = [make('nwtc', max_memory=mm)._fblock_size()
+                 for mm in [0, max_memory, 2 * max_memory, 1e12]]
+        self.assertEqual(sizes[0], 1)
+        self.assertEqual(sizes[-1], n_f)
+        self.assertEqual(sorted(sizes), sizes)
+        # The blocks cover all frequencies once.
+        tsr = make('nwtc', block_size=13)
+        idx = np.concatenate([np.arange(n_f)[slc]
+                              for slc in tsr._iter_fblocks()])
+        self.assertTrue((idx == np.arange(n_f)).all())
+        # A single block (with random phases) is the unblocked run.
+        ref = make('stress')().uturb
+        self.assertTrue((make('stress', block_size=n_f)().uturb == ref).all())
+
+
+class ensembleTest(unittest.TestCase):
+
+    def check(self, case, seeds, **kwargs):
+        tsr = make(case, **kwargs)
+        outs = list(tsr.run_ensemble(seeds))
+        self.assertEqual(len(outs), len(seeds))
+        for seed, out in zip(seeds, outs):
+            self.assertEqual(out.info['RandSeed'], seed)
+            ref = run_seed(case, seed, **kwargs)
+            self.assertLess(np.abs(out.uturb - ref).max(),
+                            1e-5 * np.abs(ref).max())
+        # The RandSeed of the run is not changed.
+        self.assertEqual(tsr.RandSeed, 1234)
+
+    def test_single_seed(self,):
+        for case in ['nwtc', 'iec', 'stress']:
+            self.check(case, [11])
+            self.check(case, [11], max_memory=max_memory)
+
+    def test_seeds(self,):
+        tsr = make('nwtc', max_memory=max_memory)
+        self.assertLess(tsr._fblock_size(3), tsr._fblock_size(1))
+        self.assertLess(tsr._fblock_size(1), tsr.grid.n_f)
+        for case in ['nwtc', 'stress']:
+            self.check(case, [11, -5, 1234])
+            self.check(case, [11, -5, 1234], max_memory=max_memory)
+            self.check(case, [11, -5, 1234], block_size=13)
+
+
+class philoxTest(unittest.TestCase):
+
+    # The phases of the 'iec' case (zero Reynold's stress) are drawn
+    # only by the phase model.
+    def run_philox(self, **kwargs):
+        tsr = make('iec', **kwargs)
+        tsr.phase = philoxPhase()
+        return tsr().uturb
+
+    def test_blocks(self,):
+        # Any block of frequencies can be computed independently.
+        tsr = make('iec', ny=3, nz=3)
+        tsr.grid = pyts.tsGrid(center=30, ny=3, nz=3, height=10, width=12,
+                               time_sec=600, dt=0.5)
+        phase = philoxPhase()
+        ref = phase(tsr)
+        for fslc in [slice(0, 13), slice(5, 200), slice(63, 65),
+                     slice(100, None), slice(1, 300, 7)]:
+            self.assertTrue((phase(tsr, fslc) == ref[..., fslc]).all())
+        # The phases of a different seed differ.
+        other = philoxPhase(seed=11)(tsr)
+        self.assertFalse(np.allclose(other, ref))
+
+    def test_invariance(self,):
+        # The time-series do not depend on the frequency blocks or the
+        # number of cores.
+        ref = self.run_philox()
+        for kwargs in [dict(block_size=13), dict(max_memory=max_memory),
+                       dict(ncore=2), dict(ncore=3, block_size=7)]:
+            out = self.run_philox(**kwargs)
+            self.assertLess(np.abs(out - ref).max(), 1e-5 * np.abs(ref).max())
+
+
+def iec_spec(ti):
+    return pyts.specModels.iecvkm('NTM', 1, 3, ti)
+
+
+class storeTest(unittest.TestCase):
+
+    def sweep(self, store, tis=('A', 'B', 'C'), **kwargs):
+        # A sweep of turbulence-intensity classes (with zero Reynold's
+        # stress).
+        tsr = make('iec', phase_store=store, **kwargs)
+        outs = []
+        for ti in tis:
+            tsr.reset()
+            tsr.spec = iec_spec(ti)
+            outs.append((tsr().uturb, tsr.cohere.info.get('phases')))
+        return outs
+
+    def test_reuse(self,):
+        for kwargs in [{}, dict(block_size=13)]:
+            ref = self.sweep(None, **kwargs)
+            got = self.sweep(pyts.phaseStore(), **kwargs)
+            # The phases are computed once, and reused exactly.
+            self.assertEqual([g[1] for g in got], [None, 'stored', 'stored'])
+            for r, g in zip(ref, got):
+                self.assertTrue((r[0] == g[0]).all())
+
+    def test_memmap(self,):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            fname = path.join(tmpdir, 'phases.npy')
+            ref = self.sweep(None, ('A', 'B'))
+            out = self.sweep(pyts.phaseStore(fname), ('A', ))
+            self.assertTrue((out[0][0] == ref[0][0]).all())
+            # A new store (e.g. in another process) loads the phases
+            # from the file.
+            out = self.sweep(pyts.phaseStore(fname), ('B', ))
+            self.assertEqual(out[0][1], 'stored')
+            self.assertTrue((out[0][0] == ref[1][0]).all())
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_miss(self,):
+        store = pyts.phaseStore()
+        make('iec', phase_store=store)()
+        # A different seed, block size or coherence does not reuse the
+        # phases.
+        for kwargs, cohere in [(dict(RandSeed=11), None),
+                               (dict(block_size=13), None),
+                               ({}, pyts.cohereModels.iec(IECedition=2))]:
+            runs = [make('iec', phase_store=store, **kwargs),
+                    make('iec', **kwargs)]
+            if cohere is not None:
+                for tsr in runs:
+                    tsr.cohere = cohere
+            out, ref = [tsr().uturb for tsr in runs]
+            self.assertIsNone(runs[0].cohere.info.get('phases'))
+            self.assertTrue((out == ref).all())
+
+    def test_interface(self,):
+        # The phases are available (by key) once they are committed.
+        store = pyts.phaseStore()
+        ph = random_phases((3, 4, 10))
+        store.begin(ph.shape)
+        store.write(slice(0, 6), ph[..., :6])
+        store.write(slice(6, 10), ph[..., 6:])
+        self.assertIsNone(store.get('key'))
+        store.commit('key', None)
+        self.assertTrue((store.get('key') == ph).all())
+        self.assertIsNone(store.get('other'))
+        store.begin(ph.shape)
+        self.assertIsNone(store.get('key'))
+
+
+class sharedFactorTest(unittest.TestCase):
+
+    def test_groups(self,):
+        # The default NWTC v and w coherence is identical.
+        cohi = make('nwtc').cohere
+        self.assertEqual(cohi._coh_groups(), [[0], [1, 2]])
+        tsr = make('nwtc')
+        tsr.cohere = pyts.cohereModels.nwtc(b=[0., 0.01, 0.02])
+        self.assertEqual(tsr.cohere._coh_groups(), [[0], [1], [2]])
+
+    def test_phases(self,):
+        # The shared factorization correlates each component as it is
+        # correlated alone.
+        for backend in ['numpy', 'tslib']:
+            cohi = make('nwtc', cohere_backend=backend).cohere
+            if not backends._available(backends.registry[backend], cohi):
+                continue
+            f = cohi.grid.f
+            ph = random_phases((3, cohi.n_p, len(f)))
+            out = cohi.calc_phases(ph.copy(order='F'))
+            for comp in range(3):
+                tmp = ph[comp][:, None, :].copy(order='F')
+                backends.numpyBackend()(cohi, tmp, comp, f)
+                self.assertLess(np.abs(out[comp] - tmp[:, 0]).max(), 1e-5)
+
+
+class ifftTest(unittest.TestCase):
+
+    def test_stage(self,):
+        tsr = make('nwtc')
+        spec = random_phases((3, 4, 5, 65))
+        ref = np.fft.irfft(spec.astype(np.complex128), 128)
+        for stage in [irfftStage(), irfftStage(workers=2),
+                      irfftStage(use_scipy=False),
+                      irfftStage(workers=3, use_scipy=False)]:
+            out = np.empty((3, 4, 5, 128), dtype=np.float32)
+            res = stage(tsr, spec.copy(), out=out)
+            self.assertIs(res, out)
+            self.assertLess(np.abs(out - ref).max(), 1e-6)
+            out = stage(tsr, spec.copy())
+            self.assertEqual(out.dtype, np.float32)
+            self.assertLess(np.abs(out - ref).max(), 1e-6)
+
+    def test_ncore(self,):
+        ref = make('nwtc', cohere_backend='numpy')()
+        self.assertEqual(ref.uturb.dtype, np.float32)
+        out = make('nwtc', cohere_backend='numpy', ncore=2)().uturb
+        self.assertLess(np.abs(out - ref.uturb).max(),
+                        1e-5 * np.abs(ref.uturb).max())
+
+    def test_window(self,):
+        # The output period is a copy, rather than a view of the
+        # full-length inverse fft.
+        tsr = make('nwtc')
+        tsr.grid = pyts.tsGrid(center=30, ny=5, nz=4, height=10, width=12,
+                               time_sec=80, time_sec_out=60, dt=0.5)
+        self.assertLess(tsr.grid.n_t_out, tsr.grid.n_t)
+        out = tsr().uturb
+        self.assertEqual(out.shape[-1], tsr.grid.n_t_out)
+        self.assertIsNone(out.base)
+
+
+class assemblyTest(unittest.TestCase):
+
+    def test_spectrum(self,):
+        # The time-series are the inverse fft of sqrt(S) times the
+        # (uncorrelated) phases.
+        for case in ['nwtc', 'iec']:
+            tsr = make(case)
+            grid = tsr.grid
+            tsr.stress = pyts.stressModels.uniform(0., 0., 0.)
+            tsr.cohere = pyts.cohereModels.none()
+            ph = random_phases((3, grid.n_p, grid.n_f))
+            tsr.phase = fixedPhase(ph)
+            spec = np.zeros((3, grid.n_z, grid.n_y, grid.n_f + 1),
+                            dtype=np.complex128)
+            spec[..., 1:] = (np.sqrt(np.array(tsr.spec.array, dtype=float)) *
+                             grid.reshape(ph))
+            ts = np.fft.irfft(spec, grid.n_t)
+            i0 = tsr._seed2randgen(tsr.RandSeed).randint(
+                grid.n_t - grid.n_t_out + 1)
+            ts = ts[..., i0:i0 + grid.n_t_out] / (grid.dt / grid.n_f) ** 0.5
+            ts -= ts.mean(-1)[..., None]
+            out = tsr().uturb
+            self.assertLess(np.abs(out - ts).max(), 1e-5 * np.abs(ts).max())
+
+
+class processPoolTest(unittest.TestCase):
+
+    def setUp(self,):
+        # Count the calls of the process-pool correlation.
+        self.calc_phases = parallel.calc_phases
+        self.n_call = 0
+
+        def count(*args):
+            self.n_call += 1
+            return self.calc_phases(*args)
+        parallel.calc_phases = count
+
+    def tearDown(self,):
+        parallel.calc_phases = self.calc_phases
+
+    @unittest.skipIf(not parallel.available, 'no process pool')
+    def test_ncore(self,):
+        # The frequency bands that are correlated by the worker
+        # processes give the serial result.
+        for case in ['nwtc', 'iec']:
+            for block_size in [None, 13]:
+                ref = make(case, cohere_backend='numpy',
+                           block_size=block_size)().uturb
+                for ncore in [2, 3]:
+                    out = make(case, cohere_backend='numpy', ncore=ncore,
+                               block_size=block_size)().uturb
+                    self.assertLess(np.abs(out - ref).max(),
+                                    1e-5 * np.abs(ref).max())
+        self.assertGreater(self.n_call, 0)
+
+
+class userCohereTest(unittest.TestCase):
+
+    def test_run(self,):
+        # A coherence array (or cohereUser object) gives the time-series
+        # of the coherence model.
+        for case in ['nwtc', 'iec']:
+            ref = make(case, cohere_backend='numpy')().uturb
+            cohi = make(case).cohere
+            f = cohi.grid.f
+            arr = np.array([cohi.calcCohMatrix(f, comp).transpose(1, 2, 0)
+                            for comp in range(3)])
+            for val in [arr, cohereUser(arr)]:
+                tsr = make(case)
+                tsr.cohere = val
+                out = tsr()
+                self.assertLess(np.abs(out.uturb - ref).max(),
+                                1e-5 * np.abs(ref).max())
+                self.assertIsNone(out.info['cohereModel'])
+                # The coherence object is kept by reset().
+                tsr.reset()
+                self.assertIsInstance(tsr.cohere, cohereUser)
+
+
+if __name__ == '__main__':
+    unittest.main()
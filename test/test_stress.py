@@ -0,0 +1,74 @@
+"""
+Tests of the Reynold's stress correlation (see
+:meth:`stressObj.calc_phases <pyts.stressModels.base.stressObj.calc_phases>`).
+"""
+from cases import pyts, np, make
+import unittest
+
+# Stress correlations (u'v', u'w', v'w'). The first needs an overlap
+# larger than the default one for the categories of calc_phases to
+# fit in the unit interval.
+correlations = [(0.5, 0.6, 0.7),
+                 (0.3, -0.25, 0.2),
+                 (-0.3, -0.4, 0.5),
+                 (0.2, 0.1, -0.3),
+                 (-0.2, -0.3, -0.1)]
+
+
+def set_corr(stress, corr):
+    """
+    Set the stress of the stress object `stress` to the correlations
+    `corr` (u'v', u'w', v'w') at all points.
+    """
+    stress.array = (np.array(corr)[:, None, None] *
+                    stress.stress_max).astype(np.float32)
+
+
+class stressTest(unittest.TestCase):
+
+    def test_phases(self,):
+        # The correlation of the phases (over the frequencies) is the
+        # stress correlation.
+        n_f = 200000
+        for corr in correlations:
+            tsr = make('stress', ny=2, nz=2)
+            set_corr(tsr.stress, corr)
+            rng = np.random.RandomState(0)
+            ph = np.exp(2j * np.pi * rng.rand(3, tsr.grid.n_p, n_f)
+                        ).astype(np.complex64)
+            tsr.stress.calc_phases(ph, rng)
+            for idx, (i0, i1) in enumerate([(0, 1), (0, 2), (1, 2)]):
+                real = (ph[i0] * ph[i1].conj()).real.mean(-1)
+                self.assertLess(np.abs(real - corr[idx]).max(), 0.01)
+
+    def test_stress(self,):
+        # With the same spectrum and coherence for all components, the
+        # stress of the velocity time-series is the input stress.
+        for corr in correlations[:2]:
+            tsr = make('stress', ny=3, nz=3)
+            tsr.grid = pyts.tsGrid(center=30, ny=3, nz=3, height=10,
+                                   width=12, time_sec=600, dt=0.1)
+            tsr.spec = np.ones((3, 1, 1, tsr.grid.n_f), dtype=np.float32)
+            tsr.cohere = pyts.cohereModels.nwtc(a=[3.] * 3, b=[0.01] * 3,
+                                                CohExp=0.3)
+            set_corr(tsr.stress, corr)
+            u = tsr().uturb
+            stress = tsr.stress
+            for idx, (i0, i1) in enumerate([(0, 1), (0, 2), (1, 2)]):
+                real = (u[i0] * u[i1]).mean(-1)
+                err = (real - stress.array[idx]) / stress.stress_max[idx]
+                self.assertLess(np.abs(err).max(), 0.1)
+                self.assertLess(np.abs(err.mean()), 0.03)
+
+    def test_invalid(self,):
+        tsr = make('stress', ny=2, nz=2)
+        # The 'overlap' criterion.
+        set_corr(tsr.stress, (0.9, 0.9, 0.2))
+        self.assertRaises(Exception, tsr.stress.check_validity)
+        # Three negative stresses can not overlap.
+        set_corr(tsr.stress, (-0.4, -0.5, -0.3))
+        self.assertRaises(Exception, tsr.stress.check_validity)
+
+
+if __name__ == '__main__':
+    unittest.main()